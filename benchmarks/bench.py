@@ -0,0 +1,299 @@
+"""
+Benchmarks for the resolution hot paths.
+
+Usage::
+
+    python benchmarks/bench.py --output before.json
+    # ... change something ...
+    python benchmarks/bench.py --output after.json --compare before.json
+
+Results are stored as JSON (nanoseconds per operation), so they can be
+compared between commits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+import injectpy
+from injectpy import Kernel, Lifetime, Module, factory
+
+#: name -> function preparing the benchmark and returning the operation to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str) -> Callable[[Callable], Callable]:
+    def decorator(fn: Callable[[], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[name] = fn
+        return fn
+
+    return decorator
+
+
+def make_class(name: str, dependencies: List[type]) -> type:
+    """
+    Creates a class which accepts given dependencies in ``__init__``.
+    """
+    params = [f"dep{i}" for i in range(len(dependencies))]
+    namespace: Dict[str, Any] = {}
+    exec(f"def __init__(self, {', '.join(params)}): pass", namespace)
+    init = namespace["__init__"]
+    init.__annotations__ = dict(zip(params, dependencies))
+    return type(name, (), {"__init__": init})
+
+
+def make_chain(depth: int) -> List[type]:
+    classes = [make_class("Node0", [])]
+    for i in range(1, depth):
+        classes.append(make_class(f"Node{i}", [classes[-1]]))
+
+    return classes
+
+
+@benchmark("transient")
+def transient() -> Callable[[], Any]:
+    kernel = Kernel()
+    leaf = make_class("Leaf", [])
+    service = make_class("Service", [leaf, leaf])
+    kernel.bind(service)
+    return lambda: kernel.get(service)
+
+
+@benchmark("singleton")
+def singleton() -> Callable[[], Any]:
+    kernel = Kernel()
+    service = make_class("Service", [])
+    kernel.bind(service, lifetime=Lifetime.singleton)
+    return lambda: kernel.get(service)
+
+
+@benchmark("transient_with_singleton_deps")
+def transient_with_singleton_deps() -> Callable[[], Any]:
+    kernel = Kernel()
+    deps = [make_class(f"Dep{i}", []) for i in range(5)]
+    for dep in deps:
+        kernel.bind(dep, lifetime=Lifetime.singleton)
+
+    service = make_class("Service", deps)
+    return lambda: kernel.get(service)
+
+
+@benchmark("scoped")
+def scoped() -> Callable[[], Any]:
+    kernel = Kernel()
+    dep = make_class("Dep", [])
+    service = make_class("Service", [dep])
+    kernel.bind(dep, lifetime=Lifetime.scoped)
+    kernel.bind(service, lifetime=Lifetime.scoped)
+
+    def run() -> None:
+        with kernel.nested_scope() as scope:
+            scope.get(service)
+            scope.get(service)
+
+    return run
+
+
+@benchmark("reused_scope")
+def reused_scope() -> Callable[[], Any]:
+    kernel = Kernel()
+    dep = make_class("Dep", [])
+    service = make_class("Service", [dep])
+    kernel.bind(dep, lifetime=Lifetime.scoped)
+    kernel.bind(service, lifetime=Lifetime.scoped)
+    scope = kernel.nested_scope()
+
+    def run() -> None:
+        with scope:
+            scope.get(service)
+            scope.get(service)
+
+    return run
+
+
+@benchmark("alias_chain")
+def alias_chain() -> Callable[[], Any]:
+    kernel = Kernel()
+    classes = [make_class(f"Alias{i}", []) for i in range(10)]
+    for interface, implementation in zip(classes, classes[1:]):
+        kernel.bind(interface, to=implementation)
+
+    return lambda: kernel.get(classes[0])
+
+
+@benchmark("deep_graph")
+def deep_graph() -> Callable[[], Any]:
+    kernel = Kernel()
+    classes = make_chain(60)
+    return lambda: kernel.get(classes[-1])
+
+
+@benchmark("wide_graph")
+def wide_graph() -> Callable[[], Any]:
+    kernel = Kernel()
+    deps = [make_class(f"Dep{i}", []) for i in range(60)]
+    service = make_class("Service", deps)
+    return lambda: kernel.get(service)
+
+
+@benchmark("interceptors")
+def interceptors() -> Callable[[], Any]:
+    kernel = Kernel()
+    deps = [make_class(f"Dep{i}", []) for i in range(10)]
+    service = make_class("Service", deps)
+    for cls in deps + [service]:
+        for _ in range(3):
+            kernel.intercept(cls, handler=lambda instance: None)
+
+    return lambda: kernel.get(service)
+
+
+@benchmark("compiled_deep_graph")
+def compiled_deep_graph() -> Callable[[], Any]:
+    kernel = Kernel()
+    classes = make_chain(60)
+    return kernel.compile(classes[-1])
+
+
+@benchmark("install_module")
+def install_module() -> Callable[[], Any]:
+    attrs: Dict[str, Any] = {}
+    for i in range(200):
+        cls = make_class(f"Service{i}", [])
+        namespace: Dict[str, Any] = {"cls": cls}
+        exec("def create(self): return cls()", namespace)
+        fn = namespace["create"]
+        fn.__annotations__ = {"return": cls}
+        attrs[f"create_{i}"] = factory()(fn)
+
+    module_cls = type("LargeModule", (Module,), attrs)
+
+    def run() -> None:
+        Kernel().install(module_cls())
+
+    return run
+
+
+@benchmark("child_kernel")
+def child_kernel() -> Callable[[], Any]:
+    kernel = Kernel()
+    classes = [make_class(f"Service{i}", []) for i in range(200)]
+    for cls in classes:
+        kernel.bind(cls, lifetime=Lifetime.singleton)
+        kernel.get(cls)
+
+    def run() -> None:
+        child = kernel.child(share_singletons=True)
+        child.rebind(classes[0], to=classes[1])
+
+    return run
+
+
+@benchmark("singleton_contention")
+def singleton_contention() -> Callable[[], Any]:
+    num_threads = 8
+
+    class SlowClient:
+        def __init__(self) -> None:
+            time.sleep(0.001)
+
+    clients = [type(f"Client{i}", (SlowClient,), {}) for i in range(num_threads)]
+
+    def run() -> None:
+        kernel = Kernel()
+        for client in clients:
+            kernel.bind(client, lifetime=Lifetime.singleton)
+
+        threads = [
+            threading.Thread(target=kernel.get, args=(client,)) for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    return run
+
+
+@benchmark("import")
+def import_injectpy() -> Callable[[], Any]:
+    """
+    Includes interpreter startup, compare it with ``python -c pass``.
+    """
+    path = os.path.dirname(os.path.dirname(os.path.abspath(injectpy.__file__)))
+    env = {**os.environ, "PYTHONPATH": path}
+    command = [sys.executable, "-c", "import injectpy"]
+    return lambda: subprocess.run(command, env=env, check=True)
+
+
+def measure(operation: Callable[[], Any], repeat: int) -> float:
+    """
+    Returns best time of a single operation in nanoseconds.
+    """
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def run(names: List[str], repeat: int) -> Dict[str, Any]:
+    results = {}
+    for name in names:
+        operation = BENCHMARKS[name]()
+        results[name] = measure(operation, repeat)
+        print(f"{name:32} {results[name]:14.0f} ns", file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "unit": "ns",
+        "results": results,
+    }
+
+
+def compare(base: Dict[str, Any], current: Dict[str, Any]) -> None:
+    print(f"{'benchmark':32} {'base':>12} {'current':>12} {'change':>9}")
+    for name, value in current["results"].items():
+        before: Optional[float] = base["results"].get(name)
+        if before is None:
+            print(f"{name:32} {'-':>12} {value:12.0f} {'-':>9}")
+            continue
+
+        change = (value - before) / before * 100
+        print(f"{name:32} {before:12.0f} {value:12.0f} {change:+8.1f}%")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("benchmarks", nargs="*", help="names of benchmarks to run")
+    parser.add_argument("--output", "-o", help="write JSON results to a file")
+    parser.add_argument("--compare", "-c", help="compare with results from a file")
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run(args.benchmarks or list(BENCHMARKS), args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.compare:
+        with open(args.compare) as fp:
+            compare(json.load(fp), results)
+
+
+if __name__ == "__main__":
+    main()
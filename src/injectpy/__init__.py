@@ -1,12 +1,46 @@
-from .exceptions import BindingIsScoped
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import (
+    BindingIsAsync,
+    BindingIsScoped,
+    CaptiveDependency,
+    CircularDependency,
+    DisposalError,
+    KernelIsFrozen,
+    MissingBinding,
+    PoolExhausted,
+)
 from .kernel import Kernel
 from .module import Module, factory, intercept
+from .providers import Lazy, Provider
 from .types import Binder, Lifetime
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .instrumentation import Observer, ResolveEvent, StatsCollector
+
 
 Singleton = Lifetime.singleton
 Transient = Lifetime.transient
 Scoped = Lifetime.scoped
+Pooled = Lifetime.pooled
+
+
+#: names imported only when used, to keep ``import injectpy`` fast
+_LAZY = {
+    "Observer": "instrumentation",
+    "ResolveEvent": "instrumentation",
+    "StatsCollector": "instrumentation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        module = importlib.import_module(f".{_LAZY[name]}", __name__)
+        value = globals()[name] = getattr(module, name)
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # this is the public API, the rest of the package is internal
@@ -15,10 +49,23 @@ __all__ = [
     "Module",
     "factory",
     "intercept",
+    "Provider",
+    "Lazy",
     "Binder",
+    "Observer",
+    "ResolveEvent",
+    "StatsCollector",
     "Lifetime",
     "BindingIsScoped",
+    "BindingIsAsync",
+    "DisposalError",
+    "KernelIsFrozen",
+    "MissingBinding",
+    "CircularDependency",
+    "CaptiveDependency",
+    "PoolExhausted",
     "Singleton",
     "Transient",
     "Scoped",
+    "Pooled",
 ]
@@ -0,0 +1,191 @@
+"""
+Generates specialised Python functions for resolving a service.
+
+Compiled function creates the whole dependency subgraph of a service
+without going through the kernel: transient dependencies are inlined
+as direct constructor calls and singletons are read straight from
+the kernel's cache. Anything that's not created yet (or not supported
+by the compiler) is delegated back to ``Kernel._get``, so the result
+is exactly the same as resolving through the kernel.
+"""
+import itertools
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+from .types import Lifetime
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .kernel import Dependency, Kernel, Plan
+
+
+class Compiler:
+    def __init__(self, kernel: "Kernel") -> None:
+        self._kernel = kernel
+        self._lines: List[str] = []
+        self._namespace: Dict[str, Any] = {
+            "_kernel": kernel,
+            "_singletons": kernel._singleton,
+        }
+        self._constants: Dict[int, str] = {}
+        #: variables holding already resolved cached instances (by binding)
+        self._cached: Dict[Any, str] = {}
+        #: bindings currently being compiled (used to break cycles)
+        self._stack: List[Any] = []
+        self._counter = itertools.count()
+
+    def compile(self, service: Any) -> Callable[..., Any]:
+        key = self._constant(service)
+        # observers must see every resolution, so there's nothing to inline
+        result = (
+            self._delegate(service)
+            if self._kernel._observers
+            else self._node(service)
+        )
+
+        source = "\n".join(
+            [
+                "def resolve(scope=None):",
+                # bindings changed since compilation, fall back to the kernel
+                f"    if _kernel._version != {self._kernel._version}:",
+                f"        return _kernel._get({key}, scope)",
+                *self._lines,
+                f"    return {result}",
+            ]
+        )
+        code = compile(source, f"<injectpy: {service!r}>", "exec")
+        exec(code, self._namespace)
+        resolve: Callable[..., Any] = self._namespace["resolve"]
+        resolve.__source__ = source  # type: ignore
+        return resolve
+
+    def _constant(self, value: Any) -> str:
+        try:
+            return self._constants[id(value)]
+        except KeyError:
+            pass
+
+        name = f"_c{len(self._constants)}"
+        self._namespace[name] = value
+        self._constants[id(value)] = name
+        return name
+
+    def _variable(self) -> str:
+        return f"_v{next(self._counter)}"
+
+    def _emit(self, line: str) -> None:
+        self._lines.append(f"    {line}")
+
+    def _delegate(self, service: Any) -> str:
+        var = self._variable()
+        self._emit(f"{var} = _kernel._get({self._constant(service)}, scope)")
+        return var
+
+    def _resolve(self, plan: "Plan") -> str:
+        var = self._variable()
+        self._emit(f"{var} = _kernel._resolve({self._constant(plan)}, scope)")
+        return var
+
+    def _argument(self, plan: "Plan", dependency: "Dependency") -> str:
+        if dependency.service is None:
+            # optional argument which is not bound
+            return "None"
+
+        if dependency.deferred is not None:
+            owner = (
+                "_kernel"
+                if plan.binding.lifetime is Lifetime.singleton
+                else "(_kernel if scope is None else scope)"
+            )
+            deferred = self._constant(dependency.deferred)
+            service = self._constant(dependency.service)
+            return f"{deferred}({owner}, {service})"
+
+        if dependency.collection is None:
+            return self._node(dependency.service)
+
+        items = [
+            self._plan_node(dependency.service, plan)
+            for plan in self._kernel._all_plans(dependency.service)
+        ]
+        var = self._variable()
+        if dependency.collection is list:
+            self._emit(f"{var} = [{', '.join(items)}]")
+        else:
+            self._emit(f"{var} = ({''.join(item + ', ' for item in items)})")
+
+        return var
+
+    def _node(self, service: Any) -> str:
+        """
+        Emits code creating given service and returns name of the variable
+        which holds the instance.
+        """
+        kernel = self._kernel
+        plan = kernel._plans.get(service)
+        if plan is None:
+            plan = kernel._plan(service)
+
+        return self._plan_node(service, plan)
+
+    def _plan_node(self, service: Any, plan: "Plan") -> str:
+        binding = plan.binding
+        if binding.instance is not None:
+            return self._constant(binding.instance)
+
+        if binding in self._cached:
+            return self._cached[binding]
+
+        if binding.lifetime is Lifetime.singleton:
+            var = self._variable()
+            self._emit("try:")
+            self._emit(f"    {var} = _singletons[{self._constant(binding)}]")
+            self._emit("except KeyError:")
+            self._emit(
+                f"    {var} = _kernel._resolve({self._constant(plan)}, scope)"
+            )
+            self._cached[binding] = var
+            return var
+
+        if binding.lifetime is Lifetime.scoped:
+            var = self._variable()
+            owner = (
+                "scope"
+                if binding.scope_level is None
+                else f"scope._levels[{self._constant(binding.scope_level)}]"
+            )
+            self._emit("try:")
+            self._emit(f"    {var} = {owner}._instances[{self._constant(binding)}]")
+            self._emit("except (AttributeError, KeyError):")
+            self._emit(
+                f"    {var} = _kernel._resolve({self._constant(plan)}, scope)"
+            )
+            self._cached[binding] = var
+            return var
+
+        if binding.lifetime is Lifetime.pooled:
+            var = self._resolve(plan)
+            self._cached[binding] = var
+            return var
+
+        if binding in self._stack or plan.is_async:
+            # circular dependency or async factory - let the kernel deal with it
+            return self._resolve(plan)
+
+        self._stack.append(binding)
+        if plan.target is None:
+            var = self._node(plan.to)
+        else:
+            arguments = ", ".join(
+                f"{dep.name}={self._argument(plan, dep)}"
+                for dep in plan.dependencies
+            )
+            var = self._variable()
+            self._emit(f"{var} = {self._constant(plan.target)}({arguments})")
+
+        if plan.interceptor is not None:
+            # variable can be shared with other nodes, so it's not reused
+            intercepted = self._variable()
+            self._emit(f"{intercepted} = {self._constant(plan.interceptor)}({var})")
+            var = intercepted
+
+        self._stack.pop()
+        return var
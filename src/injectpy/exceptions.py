@@ -1,6 +1,46 @@
+from typing import List
+
+
 class Error(Exception):
     pass
 
 
 class BindingIsScoped(Error):
     pass
+
+
+class BindingIsAsync(Error):
+    pass
+
+
+class PoolExhausted(Error):
+    pass
+
+
+class KernelIsFrozen(Error):
+    pass
+
+
+class MissingBinding(Error):
+    pass
+
+
+class CircularDependency(Error):
+    pass
+
+
+class CaptiveDependency(Error):
+    """
+    Singleton (or pooled service) depends on a scoped service, which would
+    outlive its scope.
+    """
+
+
+class DisposalError(Error):
+    """
+    Raised when some of scoped instances could not be disposed.
+    """
+
+    def __init__(self, errors: List[Exception]) -> None:
+        super().__init__(f"{len(errors)} error(s) while disposing scoped instances")
+        self.errors = errors
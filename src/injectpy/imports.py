@@ -0,0 +1,38 @@
+"""
+Lazy references to classes and factories (``"package.module:Name"``),
+imported only when a binding is resolved for the first time.
+"""
+import importlib
+from typing import Any, Dict, List
+
+import attr
+
+
+def validate_reference(reference: str) -> None:
+    module, _, name = reference.partition(":")
+    if not module or not name:
+        raise ValueError(f"expected 'package.module:Name' reference, got {reference!r}")
+
+
+def import_reference(reference: str) -> Any:
+    """
+    Imports module and returns object the reference points to.
+    """
+    module, _, name = reference.partition(":")
+    obj: Any = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part)
+
+    return obj
+
+
+@attr.dataclass(frozen=True)
+class ImportReport:
+    """
+    Which lazy references used by bindings were imported.
+    """
+
+    #: reference -> time spent on importing it (in seconds)
+    imported: Dict[str, float]
+    #: references which were never needed
+    not_imported: List[str]
@@ -0,0 +1,143 @@
+"""
+Observing what the kernel does: which services are resolved, how often
+and how long it takes.
+"""
+import collections
+import threading
+from typing import Any, Deque, Dict, List, Optional
+
+import attr
+
+from .types import Lifetime
+
+
+@attr.dataclass(frozen=True)
+class ResolveEvent:
+    """
+    Information about a single resolution of a service.
+    """
+
+    #: requested service
+    service: Any
+    lifetime: Lifetime
+    #: if instance was already created (singleton, scoped or instance binding)
+    cached: bool
+    #: scope used for resolution (if any)
+    scope: Optional[Any] = None
+    #: resolution time in seconds (including dependencies), only when finished
+    duration: Optional[float] = None
+    #: exception raised while resolving (if any), only when finished
+    error: Optional[BaseException] = None
+
+
+class Observer:
+    """
+    Receives events about resolutions. Attach with ``Kernel.add_observer()``.
+    """
+
+    def resolve_started(self, event: ResolveEvent) -> None:
+        pass
+
+    def resolve_finished(self, event: ResolveEvent) -> None:
+        pass
+
+
+@attr.dataclass(frozen=True)
+class ServiceStats:
+    """
+    Aggregated statistics of resolutions of a single service.
+    """
+
+    service: Any
+    count: int
+    hits: int
+    errors: int
+    #: total time spent on resolution in seconds
+    total: float
+    #: percentiles of resolution time, computed from recent resolutions
+    p50: float
+    p95: float
+    p99: float
+
+    @property
+    def misses(self) -> int:
+        return self.count - self.hits
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = attr.asdict(self)
+        result["service"] = getattr(self.service, "__qualname__", repr(self.service))
+        result["misses"] = self.misses
+        return result
+
+
+class StatsCollector(Observer):
+    """
+    Observer which aggregates counts and latency per service.
+
+    :param samples: how many recent durations are kept per service
+        to compute percentiles
+    """
+
+    def __init__(self, samples: int = 1000) -> None:
+        self._samples = samples
+        self._lock = threading.Lock()
+        self._counts: Dict[Any, List[int]] = {}
+        self._totals: Dict[Any, float] = {}
+        self._durations: Dict[Any, Deque[float]] = {}
+
+    def resolve_finished(self, event: ResolveEvent) -> None:
+        assert event.duration is not None
+        with self._lock:
+            counts = self._counts.get(event.service)
+            if counts is None:
+                # count, hits, errors
+                counts = self._counts[event.service] = [0, 0, 0]
+                self._totals[event.service] = 0.0
+                self._durations[event.service] = collections.deque(
+                    maxlen=self._samples
+                )
+
+            counts[0] += 1
+            counts[1] += event.cached
+            counts[2] += event.error is not None
+            self._totals[event.service] += event.duration
+            self._durations[event.service].append(event.duration)
+
+    def stats(self) -> List[ServiceStats]:
+        """
+        Returns statistics of every service, most time-consuming first.
+        """
+        with self._lock:
+            result = [
+                ServiceStats(
+                    service=service,
+                    count=count,
+                    hits=hits,
+                    errors=errors,
+                    total=self._totals[service],
+                    p50=_percentile(self._durations[service], 50),
+                    p95=_percentile(self._durations[service], 95),
+                    p99=_percentile(self._durations[service], 99),
+                )
+                for service, (count, hits, errors) in self._counts.items()
+            ]
+
+        return sorted(result, key=lambda stats: stats.total, reverse=True)
+
+    def dump(self) -> List[Dict[str, Any]]:
+        """
+        Returns statistics as JSON-serializable data (e.g. for debug endpoints).
+        """
+        return [stats.as_dict() for stats in self.stats()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
+            self._durations.clear()
+
+
+def _percentile(values: Deque[float], percent: int) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, len(ordered) * percent // 100)
+    return ordered[index]
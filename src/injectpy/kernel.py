@@ -1,107 +1,705 @@
-import contextlib
+import contextvars
+import inspect
 import threading
+import time
+import weakref
 from collections import OrderedDict
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     DefaultDict,
     Dict,
+    Iterable,
     List,
     Optional,
+    Set,
+    Tuple,
     Type,
     TypeVar,
+    Union,
 )
 
-import attr
-
-from .exceptions import BindingIsScoped
-from .reflection import Inspection, Parameter
+from .compiler import Compiler
+from .exceptions import (
+    BindingIsAsync,
+    BindingIsScoped,
+    CircularDependency,
+    DisposalError,
+    KernelIsFrozen,
+)
+from .providers import Lazy, Provider
+from .reflection import Inspection, returned_type
 from .types import AbstractModule, Binder, Lifetime
+from .utils import adispose, dispose, slots_repr, strip_collection
+
+if TYPE_CHECKING:  # pragma: no cover
+    # not needed for synchronous resolution, imported when used
+    import asyncio
+
+    from .imports import ImportReport
+    from .instrumentation import Observer, ResolveEvent
+    from .pool import Pool, PoolStats
+    from .snapshot import Snapshot
+    from .validation import ValidationReport
 
 
-@attr.dataclass(frozen=True)
 class Binding:
     """
     Information about a single binding.
+
+    Bindings are compared by identity, they are used as keys of
+    cached instances (a service can have multiple bindings).
+    """
+
+    __slots__ = (
+        "service",
+        "instance",
+        "to",
+        "factory",
+        "lifetime",
+        "pool_size",
+        "pool_timeout",
+        "scope_level",
+    )
+
+    def __init__(
+        self,
+        service: Any,
+        instance: Any = None,
+        to: Any = None,
+        factory: Union[Callable, str] = None,
+        lifetime: Lifetime = Lifetime.transient,
+        pool_size: int = None,
+        pool_timeout: float = None,
+        scope_level: Any = None,
+    ) -> None:
+        self.service = service
+        self.instance = instance
+        #: service or lazy reference (``"package.module:Name"``)
+        self.to = to
+        #: callable or lazy reference (``"package.module:Name"``)
+        self.factory = factory
+        self.lifetime = lifetime
+        #: maximum number of instances for pooled lifetime
+        self.pool_size = pool_size
+        #: how long to wait when pool is exhausted (``None`` - forever)
+        self.pool_timeout = pool_timeout
+        #: level of the scope keeping scoped/pooled instances (innermost if None)
+        self.scope_level = scope_level
+
+    __repr__ = slots_repr
+
+
+class Dependency:
+    """
+    Single argument which has to be injected when calling a target.
+    """
+
+    __slots__ = ("name", "service", "collection", "deferred", "hint")
+
+    def __init__(
+        self,
+        name: str,
+        service: Optional[Any],
+        collection: Callable = None,
+        deferred: Callable = None,
+        hint: Any = None,
+    ) -> None:
+        #: name of the keyword argument
+        self.name = name
+        #: service to resolve, ``None`` if optional argument is not bound
+        self.service = service
+        #: ``list`` or ``tuple`` if instances of all bindings are injected
+        self.collection = collection
+        #: ``Provider`` or ``Lazy`` if the service is resolved on demand
+        self.deferred = deferred
+        #: type hint of the argument, binding it changes the dependency
+        self.hint = hint
+
+    __repr__ = slots_repr
+
+
+class Plan:
+    """
+    Precomputed information on how to resolve a service.
+
+    Plans are built once per service and reused until bindings change,
+    so reflection is not repeated on every resolution.
+    """
+
+    __slots__ = ("binding", "target", "to", "dependencies", "is_async", "interceptor")
+
+    def __init__(
+        self,
+        binding: Binding,
+        target: Callable = None,
+        to: Any = None,
+        dependencies: Tuple[Dependency, ...] = (),
+        is_async: bool = False,
+        interceptor: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.binding = binding
+        #: callable creating the instance (None for instance and ``to=`` bindings)
+        self.target = target
+        #: service providing the instance for ``to=`` bindings (references
+        #: imported); it's created by the plan itself when target is set too
+        self.to = to
+        self.dependencies = dependencies
+        #: if target is a coroutine function (has to be resolved with ``aget()``)
+        self.is_async = is_async
+        #: interceptors matching the service fused into one call returning
+        #: the final instance (None when there are none)
+        self.interceptor = interceptor
+
+    __repr__ = slots_repr
+
+
+class WeakTarget:
+    """
+    Calls a class without keeping it alive.
+
+    Used by plans of auto-wired classes, so dynamically created classes
+    can be garbage collected even though the kernel has resolved them.
     """
 
-    service: type
-    instance: Optional[Any] = None
-    to: Optional[Any] = None
-    factory: Optional[Callable] = None
-    lifetime: Lifetime = Lifetime.transient
+    __slots__ = ("_ref",)
+
+    def __init__(self, ref: "weakref.ref[Any]") -> None:
+        self._ref = ref
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        target = self._ref()
+        # plan is dropped together with the class, so it's still alive here
+        assert target is not None
+        return target(*args, **kwargs)
 
 
 T = TypeVar("T")
 
 
 class Scope:
-    def __init__(self, kernel: "Kernel") -> None:
+    """
+    Holds instances of scoped bindings.
+
+    When scope ends its instances are disposed (closed) in reverse order
+    of creation. Use ``async with`` to dispose instances asynchronously.
+    Pooled instances are returned to their pools instead.
+
+    While the ``with`` block is running, the scope is also used by
+    ``Kernel.get()`` called in the same thread or asyncio task.
+
+    Scopes can be nested (e.g. per-connection and per-message). Bindings
+    with ``scope_level`` keep their instances in the closest scope with
+    that level, the other ones use the innermost scope.
+
+    Scope can be used again after it ends (or after ``reset()``), which
+    is cheaper than creating a new one for every unit of work.
+    """
+
+    __slots__ = (
+        "_kernel",
+        "parent",
+        "level",
+        "_levels",
+        "_instances",
+        "_owned",
+        "_owned_ids",
+        "_async_locks",
+        "_pooled",
+        "_tokens",
+    )
+
+    def __init__(
+        self, kernel: "Kernel", parent: "Scope" = None, level: Any = None
+    ) -> None:
         self._kernel = kernel
+        self.parent = parent
+        self.level = level
+        #: closest scope of every level, so lookup doesn't walk the parents
+        self._levels: Dict[Any, Scope] = dict(parent._levels) if parent else {}
+        if level is not None:
+            self._levels[level] = self
         self._instances: Dict[Any, Any] = OrderedDict()
+        #: instances created by the scope (others are only cached by it)
+        self._owned: List[Any] = []
+        self._owned_ids: Set[int] = set()
+        self._async_locks: "Dict[Any, asyncio.Lock]" = {}
+        #: instances checked out of pools
+        self._pooled: "List[Tuple[Pool, Any]]" = []
+        #: tokens for restoring previous ambient scope
+        self._tokens: List[contextvars.Token] = []
 
     def __enter__(self) -> "Scope":
+        self._tokens.append(_current_scope.set(self))
         return self
 
     def __exit__(
         self, exc_type: Type[BaseException], exc_val: BaseException, exc_tb: Any
-    ) -> bool:
-        self._instances = OrderedDict()
-        return False
+    ) -> None:
+        _current_scope.reset(self._tokens.pop())
+        self.reset()
+
+    async def __aenter__(self) -> "Scope":
+        self._tokens.append(_current_scope.set(self))
+        return self
+
+    async def __aexit__(
+        self, exc_type: Type[BaseException], exc_val: BaseException, exc_tb: Any
+    ) -> None:
+        _current_scope.reset(self._tokens.pop())
+        await self.areset()
+
+    def reset(self) -> None:
+        """
+        Disposes instances of the scope, so it can be used again.
+
+        :raises DisposalError: when disposing some instances failed
+        """
+        errors: Optional[List[Exception]] = None
+        try:
+            for instance in reversed(self._owned):
+                try:
+                    dispose(instance)
+                except Exception as exc:
+                    errors = errors or []
+                    errors.append(exc)
+        finally:
+            self._clear()
+
+        if errors:
+            raise DisposalError(errors) from errors[0]
+
+    async def areset(self) -> None:
+        """
+        Async version of ``reset()``.
+        """
+        errors: Optional[List[Exception]] = None
+        try:
+            for instance in reversed(self._owned):
+                try:
+                    await adispose(instance)
+                except Exception as exc:
+                    errors = errors or []
+                    errors.append(exc)
+        finally:
+            self._clear()
+
+        if errors:
+            raise DisposalError(errors) from errors[0]
+
+    def _own(self, instance: Any) -> None:
+        """
+        Remembers instance created by the scope, so it's disposed on reset.
+        """
+        # interceptors could return the same instance for multiple bindings
+        if id(instance) not in self._owned_ids:
+            self._owned_ids.add(id(instance))
+            self._owned.append(instance)
+
+    def _clear(self) -> None:
+        """
+        Empties the scope and returns pooled instances to their pools.
+
+        Containers are cleared in place, so a reused scope doesn't allocate
+        new ones (entering it still creates a context variable token).
+        """
+        if self._async_locks:
+            self._async_locks.clear()
+
+        if not self._instances:
+            return
+
+        for pool, instance in reversed(self._pooled):
+            pool.release(instance)
+
+        self._instances.clear()
+        self._owned.clear()
+        self._owned_ids.clear()
+        self._pooled.clear()
+
+    def nested_scope(self, level: Any = None) -> "Scope":
+        """
+        Returns a new scope which uses this one for bindings of outer levels.
+        """
+        return Scope(self._kernel, parent=self, level=level)
 
     def get(self, interface: Type[T]) -> T:
+        compiled = self._kernel._compiled.get(interface)
+        if compiled is not None:
+            return compiled(self)
+
         return self._kernel._get(interface, scope=self)
 
+    def get_all(self, interface: Type[T]) -> List[T]:
+        return self._kernel._get_all(interface, scope=self)
+
+    async def aget(self, interface: Type[T], *, max_concurrency: int = None) -> T:
+        return await self._kernel._aget(
+            interface, self, self._kernel._limit(max_concurrency)
+        )
+
+    async def aget_all(
+        self, interface: Type[T], *, max_concurrency: int = None
+    ) -> List[T]:
+        return await self._kernel._aget_all(
+            interface, self, self._kernel._limit(max_concurrency)
+        )
+
+
+#: result of singleton construction which failed
+_FAILED = object()
+
+
+class Construction:
+    """
+    Singleton which is being created, shared by every thread, event loop
+    and task which needs it.
+    """
+
+    __slots__ = ("future", "thread", "is_async")
+
+    def __init__(self, is_async: bool) -> None:
+        import concurrent.futures
+
+        self.future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+        # running future can't be cancelled by one of the waiting tasks
+        self.future.set_running_or_notify_cancel()
+        #: thread creating the instance
+        self.thread = threading.get_ident()
+        #: if it's created by ``aget()``
+        self.is_async = is_async
+
+
+async def _gather(awaitables: List[Awaitable[Any]]) -> List[Any]:
+    """
+    Awaits all awaitables concurrently and returns their results.
+
+    Unlike ``asyncio.gather()`` the remaining tasks are cancelled (and
+    awaited) when one of them fails, so nothing keeps creating instances
+    after the error has been raised.
+    """
+    if len(awaitables) == 1:
+        return [await awaitables[0]]
+
+    if not awaitables:
+        return []
+
+    import asyncio
+
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        done, pending = await asyncio.wait(
+            tasks, return_when=asyncio.FIRST_EXCEPTION
+        )
+    except BaseException:
+        # the caller was cancelled
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.wait(tasks)
+        raise
+
+    if pending:
+        for task in pending:
+            task.cancel()
+
+        await asyncio.wait(pending)
+
+    # exceptions are retrieved for every task, so asyncio doesn't log them
+    errors = [task.exception() for task in done if not task.cancelled()]
+    error = next((exc for exc in errors if exc is not None), None)
+    if error is not None:
+        raise error
+
+    return [task.result() for task in tasks]
+
+
+def _subclasses(service: Any) -> List[Any]:
+    """
+    Returns service and all its subclasses (if it's a class).
+    """
+    result = [service]
+    if isinstance(service, type):
+        stack = [service]
+        while stack:
+            subclasses: List[Any] = type.__subclasses__(stack.pop())
+            result.extend(subclasses)
+            stack.extend(subclasses)
+
+    return result
+
+
+def _weakly_referable(obj: Any) -> bool:
+    try:
+        weakref.ref(obj)
+    except TypeError:
+        return False
+
+    return True
+
+
+def _injects(plan: Plan, hint: Any) -> bool:
+    return plan.to == hint or any(dep.hint == hint for dep in plan.dependencies)
+
+
+def _checkable(service: Any) -> bool:
+    """
+    Checks if ``isinstance()`` can tell if an object is instance of a service.
+    """
+    return isinstance(service, type) and not (
+        getattr(service, "_is_protocol", False)
+        and not getattr(service, "_is_runtime_protocol", False)
+    )
+
+
+def _compatible(handler: Callable, service: Any) -> Optional[bool]:
+    """
+    Checks if interceptor (of a base class) can be applied to instances of
+    a service, based on its return type.
+
+    :returns: ``True`` if it returns an instance of the service, ``False``
+        if it returns an instance of another class, ``None`` if it's not
+        known (or it doesn't return anything)
+    """
+    returned = returned_type(handler)
+    if returned is None or returned is type(None):
+        return None
+
+    try:
+        return issubclass(returned, service)
+    except TypeError:
+        return None
+
+
+def _chain(
+    handlers: Tuple[Tuple[Callable, bool], ...], service: Any
+) -> Optional[Callable[[Any], Any]]:
+    """
+    Composes interceptors into one function returning the final instance.
+
+    Handler can modify the instance in place (and return ``None``) or return
+    a replacement, e.g. a proxy, which is passed to the next handler.
+
+    :param handlers: pairs of handler and flag if its replacement must be
+        checked to be an instance of the service (when its return type isn't
+        known)
+    :param service: class of the instance (referenced weakly, so auto-wired
+        classes can be garbage collected)
+    """
+    if not handlers:
+        return None
+
+    if len(handlers) == 1 and not handlers[0][1]:
+        handler = handlers[0][0]
+
+        def single(instance: Any) -> Any:
+            result = handler(instance)
+            return instance if result is None else result
+
+        return single
+
+    ref = weakref.ref(service) if any(checked for _, checked in handlers) else None
+
+    def chain(instance: Any) -> Any:
+        for handler, checked in handlers:
+            result = handler(instance)
+            if result is None:
+                continue
+
+            if checked:
+                assert ref is not None
+                cls = ref()
+                # plan is dropped together with the class, so it's still alive
+                assert cls is not None
+                if not isinstance(result, cls):
+                    raise TypeError(
+                        f"interceptor replaced {cls.__qualname__} instance with "
+                        f"{type(result).__qualname__}, which is not its subclass "
+                        f"(annotate its return type, so it's only used for the "
+                        f"service it's registered for)"
+                    )
+
+            instance = result
+
+        return instance
+
+    return chain
+
+
+#: scope entered with ``with`` in the current thread or asyncio task
+_current_scope: "contextvars.ContextVar[Optional[Scope]]" = contextvars.ContextVar(
+    "injectpy_scope", default=None
+)
+
+#: bindings being created by the current asyncio task (and tasks it waits for)
+_building: "contextvars.ContextVar[Tuple[Binding, ...]]" = contextvars.ContextVar(
+    "injectpy_building", default=()
+)
+
+
+def _start_building(binding: Binding) -> contextvars.Token:
+    """
+    Marks binding as being created by the current task, so waiting for its
+    construction again (which would never end) raises an error instead.
+    """
+    building = _building.get()
+    if binding in building:
+        raise CircularDependency(f"{binding.service!r} depends on itself")
+
+    return _building.set((*building, binding))
+
 
 class Kernel(Binder):
+    #: maximum number of cached plans of auto-wired (not bound) classes
+    implicit_plans_limit = 4096
+
     def __init__(self) -> None:
         self._bindings: DefaultDict[type, List[Binding]] = DefaultDict(list)
         self._interceptors: DefaultDict[Any, List[Callable]] = DefaultDict(list)
         self._singleton: Dict[Any, Any] = OrderedDict()
-        self._singleton_lock = threading.RLock()
+        #: singletons which are being created right now
+        self._singleton_pending: Dict[Any, Construction] = {}
+        #: construction every thread is blocked on (thread id -> construction)
+        self._singleton_waits: Dict[int, Construction] = {}
+        self._singleton_locks_guard = threading.Lock()
+        self._pools: "Dict[Binding, Pool]" = {}
+        self._pools_guard = threading.Lock()
+        self._plans: Dict[Any, Plan] = {}
+        #: plans of every binding of a service (for ``get_all()``)
+        self._multi_plans: Dict[Any, Tuple[Plan, ...]] = {}
+        #: plans for auto-wired classes, which can be garbage collected
+        self._implicit_plans: "weakref.WeakKeyDictionary[Any, Plan]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._compiled: Dict[Any, Callable[..., Any]] = {}
+        #: incremented every time configuration changes
+        self._version = 0
+        self._frozen = False
+        self._observers: "List[Observer]" = []
+        #: objects imported for lazy references (``"package.module:Name"``)
+        self._references: Dict[str, Any] = {}
+        self._import_times: Dict[str, float] = {}
+        #: reflection results loaded from disk (see ``load_snapshot()``)
+        self._snapshot: "Optional[Snapshot]" = None
+        #: hints which would be injected differently if they were bound
+        #: (only grows, so it can be shared with children as it is); weak,
+        #: so classes they refer to can still be garbage collected
+        self._unbound_hints: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        #: services without dependency cycles, so concurrent tasks can
+        #: create them (see ``_check_acyclic()``)
+        self._acyclic: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        #: configuration is shared with other kernels (see ``child()``)
+        self._shared = False
+        #: singletons are shared with other kernels too
+        self._shares_singletons = False
+        #: singletons shared before configuration changed, reused unless
+        #: they could depend on one of the overridden services
+        self._inherited: Optional[Dict[Binding, Any]] = None
+        self._overridden: List[Any] = []
+        #: ``_depends_on()`` results for every overridden service
+        self._overridden_memo: Dict[Any, Dict[Any, bool]] = {}
 
     def bind(
         self,
         service: Any,
         *,
         to: Any = None,
-        factory: Callable = None,
+        factory: Union[Callable, str] = None,
         instance: Any = None,
         lifetime: Lifetime = Lifetime.transient,
+        pool_size: int = None,
+        pool_timeout: float = None,
+        scope_level: Any = None,
     ) -> None:
         """
         Configures a binding.
+
+        ``to`` and ``factory`` can be given as ``"package.module:Name"``
+        references, imported when the binding is resolved for the first time.
         """
-        binding = Binding(
+        self._ensure_not_frozen()
+        binding = self._create_binding(
             service=service,
             to=to,
             instance=instance,
             factory=factory,
             lifetime=lifetime,
+            pool_size=pool_size,
+            pool_timeout=pool_timeout,
+            scope_level=scope_level,
         )
-        self._bindings[service].append(binding)
+        self._copy_on_write(service)
+        bound = service not in self._bindings
+        # lists are never changed in place, so they can be shared by children
+        self._bindings[service] = [*self._bindings.get(service, ()), binding]
+        self._invalidate(service, bound=bound)
 
     def rebind(
         self,
         service: Any,
         *,
         to: Any = None,
-        factory: Callable = None,
+        factory: Union[Callable, str] = None,
         instance: Any = None,
         lifetime: Lifetime = Lifetime.transient,
+        pool_size: int = None,
+        pool_timeout: float = None,
+        scope_level: Any = None,
     ) -> None:
+        self._ensure_not_frozen()
+        self._copy_on_write(service)
+        bound = service not in self._bindings
+        for binding in self._bindings.get(service, ()):
+            # instances of replaced bindings won't be used anymore
+            self._singleton.pop(binding, None)
+            self._pools.pop(binding, None)
+
         self._bindings[service] = [
-            Binding(
+            self._create_binding(
                 service=service,
                 to=to,
                 instance=instance,
                 factory=factory,
                 lifetime=lifetime,
+                pool_size=pool_size,
+                pool_timeout=pool_timeout,
+                scope_level=scope_level,
             )
         ]
+        self._invalidate(service, bound=bound)
+
+    @staticmethod
+    def _create_binding(**kwargs: Any) -> Binding:
+        binding = Binding(**kwargs)
+        if binding.lifetime is Lifetime.pooled:
+            if binding.pool_size is None or binding.pool_size < 1:
+                raise ValueError("pooled bindings require positive pool_size")
+        elif binding.pool_size is not None or binding.pool_timeout is not None:
+            raise ValueError("pool_size and pool_timeout require pooled lifetime")
+
+        for reference in (binding.to, binding.factory):
+            if isinstance(reference, str):
+                from .imports import validate_reference
+
+                validate_reference(reference)
+
+        if binding.scope_level is not None and binding.lifetime not in (
+            Lifetime.scoped,
+            Lifetime.pooled,
+        ):
+            raise ValueError("scope_level requires scoped or pooled lifetime")
+
+        return binding
 
-    def intercept(self, service: Type[T], *, handler: Callable[[T], None]) -> None:
-        self._interceptors[service].append(handler)
+    def intercept(
+        self, service: Type[T], *, handler: Callable[[T], Optional[T]]
+    ) -> None:
+        self._ensure_not_frozen()
+        self._copy_on_write(service)
+        self._interceptors[service] = [*self._interceptors.get(service, ()), handler]
+        self._invalidate(service, intercepted=True)
 
     def install(self, module: AbstractModule) -> None:
         """
@@ -109,78 +707,1401 @@ class Kernel(Binder):
         """
         module.install_module(self)
 
-    def nested_scope(self) -> Scope:
+    def child(self, *, share_singletons: bool = False) -> "Kernel":
+        """
+        Returns a kernel sharing configuration with this one.
+
+        Bindings, interceptors and resolution plans are not copied until
+        one of the kernels changes its configuration, so creating a child
+        is cheap no matter how many services are bound. Changes made
+        afterwards (by either kernel) are not visible to the other one.
+
+        :param share_singletons: reuse singletons of this kernel; when
+            configuration changes, singletons which could depend on the
+            changed service are dropped (from the changed kernel only)
+        """
+        child = type(self)()
+        child._bindings = self._bindings
+        child._interceptors = self._interceptors
+        child._plans = self._plans
+        child._multi_plans = self._multi_plans
+        child._implicit_plans = self._implicit_plans
+        child._references = self._references
+        child._import_times = self._import_times
+        child._snapshot = self._snapshot
+        child._unbound_hints = self._unbound_hints
+        child._shared = self._shared = True
+
+        if share_singletons:
+            child._singleton = self._singleton
+            child._singleton_pending = self._singleton_pending
+            child._singleton_waits = self._singleton_waits
+            child._singleton_locks_guard = self._singleton_locks_guard
+            child._shares_singletons = self._shares_singletons = True
+            child._inherited = self._inherited
+            child._overridden = self._overridden
+
+        return child
+
+    def nested_scope(self, level: Any = None) -> Scope:
         """
         Returns a new scope for scoped bindings.
+
+        :param level: level of the scope, used by bindings with ``scope_level``
+        """
+        return Scope(kernel=self, level=level)
+
+    def current_scope(self) -> Optional[Scope]:
+        """
+        Returns scope of this kernel entered in the current context (if any).
         """
-        return Scope(kernel=self)
+        scope = _current_scope.get()
+        if scope is not None and scope._kernel is self:
+            return scope
+
+        return None
 
     def get(self, interface: Type[T]) -> T:
         """
         Returns instance for given interface.
+
+        Scoped services are taken from the scope entered with ``with``
+        in the current thread or asyncio task.
         """
+        scope = _current_scope.get()
+        if scope is not None and scope._kernel is self:
+            return scope.get(interface)
+
+        compiled = self._compiled.get(interface)
+        if compiled is not None:
+            return compiled()
+
         return self._get(interface)
 
-    def _get(self, interface: Type[T], scope: Scope = None) -> T:
+    def get_all(self, interface: Type[T]) -> List[T]:
+        """
+        Returns instances of every binding of given interface, in the
+        order they were bound. Empty list if interface is not bound.
+        """
+        return self._get_all(interface, self.current_scope())
+
+    async def aget(self, interface: Type[T], *, max_concurrency: int = None) -> T:
+        """
+        Returns instance for given interface, awaiting async factories.
+
+        Independent dependencies are created concurrently. Use
+        ``max_concurrency`` to limit how many async factories can run
+        at the same time.
+        """
+        return await self._aget(
+            interface, self.current_scope(), self._limit(max_concurrency)
+        )
+
+    async def aget_all(
+        self, interface: Type[T], *, max_concurrency: int = None
+    ) -> List[T]:
+        """
+        Async version of ``get_all()``.
+        """
+        return await self._aget_all(
+            interface, self.current_scope(), self._limit(max_concurrency)
+        )
+
+    @staticmethod
+    def _limit(max_concurrency: Optional[int]) -> "Optional[asyncio.Semaphore]":
+        if max_concurrency is None:
+            return None
+
+        import asyncio
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive number")
+
+        return asyncio.Semaphore(max_concurrency)
+
+    def pool_stats(self, service: Any) -> "PoolStats":
+        """
+        Returns statistics of the pool used by a pooled binding.
+        """
+        bindings = self._bindings.get(service)
+        pool = self._pools.get(bindings[-1]) if bindings else None
+        if pool is None:
+            from .pool import PoolStats
+
+            return PoolStats()
+
+        return pool.stats()
+
+    def import_report(self) -> "ImportReport":
+        """
+        Returns which lazy references (``"package.module:Name"``) used by
+        bindings were imported so far.
+        """
+        references = {
+            reference
+            for bindings in self._bindings.values()
+            for binding in bindings
+            for reference in (binding.to, binding.factory)
+            if isinstance(reference, str)
+        }
+        from .imports import ImportReport
+
+        return ImportReport(
+            imported=dict(self._import_times),
+            not_imported=sorted(references - set(self._import_times)),
+        )
+
+    def add_observer(self, observer: "Observer") -> None:
+        """
+        Attaches an observer which will be notified about every resolution.
+
+        Kernel without observers doesn't pay anything for this feature.
+        """
+        self._observers.append(observer)
+        if len(self._observers) == 1:
+            # instance attributes take precedence over methods
+            self._get = self._observed_get  # type: ignore
+            self._aget = self._observed_aget  # type: ignore
+            self._recompile()
+
+    def remove_observer(self, observer: "Observer") -> None:
+        self._observers.remove(observer)
+        if not self._observers:
+            del self._get
+            del self._aget
+            self._recompile()
+
+    def compile(self, service: Type[T]) -> Callable[..., T]:
+        """
+        Returns a function specialised in creating given service.
+
+        The function accepts optional scope and returns the same instances
+        as ``get()`` does, but the whole dependency graph is generated
+        as plain Python code. When bindings change the function falls
+        back to regular resolution, so it's always safe to call.
+        """
         try:
-            binding = self._bindings[interface][-1]
-        except IndexError:
-            binding = Binding(interface)
+            return self._compiled[service]
+        except KeyError:
+            pass
 
-        if binding.instance:
-            return binding.instance
+        fn = self._compiled[service] = Compiler(self).compile(service)
+        return fn
 
-        lock: Any = contextlib.nullcontext()
-        cache: Optional[Dict[Any, Any]] = None
+    def validate(self) -> "ValidationReport":
+        """
+        Checks configuration without creating any instances.
 
-        if binding.lifetime == Lifetime.singleton:
-            lock = self._singleton_lock
-            cache = self._singleton
-        elif binding.lifetime == Lifetime.scoped:
-            if scope is None:
-                # attempted to use scoped binding but no scope is active
-                raise BindingIsScoped()
+        Reports missing bindings, circular dependencies and singletons
+        depending on scoped services. Report also contains all services
+        in topological order (dependencies first).
+        """
+        from .validation import Validator
 
-            cache = scope._instances
+        return Validator(self).validate()
 
-        if cache and binding.service in cache:
-            return cache[binding.service]
+    def warm_up(self, *, workers: int = None) -> Dict[Any, float]:
+        """
+        Creates every singleton upfront, in dependency order.
 
-        with lock:
-            # double lock pattern for singleton scope
-            if cache and binding.service in cache:
-                return cache[binding.service]
+        With ``workers`` singletons are created by a thread pool, so
+        independent singletons are built concurrently. Singletons which
+        need async factories are skipped (use ``aget()`` for them).
 
-            if binding.to:
-                instance = self._get(binding.to, scope=scope)
-            else:
-                bound_to = binding.factory or binding.service
-                inspection = Inspection.inspect(bound_to)
+        :returns: time (in seconds) it took to create every singleton,
+            including waiting for its dependencies
+        """
+        from .validation import dependencies
 
-                def _resolve_param(param: Parameter) -> Any:
-                    assert param.hint is not None
-                    if param.has_default and param.hint not in self._bindings:
-                        return None
+        report = self.validate()
+        report.raise_for_problems()
 
-                    return self._get(param.hint, scope=scope)
+        singletons: List[Plan] = []
+        needs_async: Set[Any] = set()
+        for service in report.order:
+            for plan in self._service_plans(service):
+                if plan.is_async or any(
+                    dep in needs_async for dep in dependencies(plan)
+                ):
+                    needs_async.add(service)
+                elif plan.binding.lifetime is Lifetime.singleton:
+                    singletons.append(plan)
 
-                arguments = {
-                    param.name: _resolve_param(param)
-                    for param in inspection.parameters
-                    if param.hint is not None
-                }
+        def create(plan: Plan) -> float:
+            start = time.perf_counter()
+            self._resolve(plan)
+            return time.perf_counter() - start
 
-                instance = bound_to(**arguments)
+        timings: Dict[Any, float] = {}
+        if workers is None:
+            durations = [create(plan) for plan in singletons]
+        else:
+            import concurrent.futures
 
-            self._call_interceptors(binding.service, instance)
-            if cache is not None:
-                cache[binding.service] = instance
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                # dependents wait for singletons which are being created
+                # by other threads
+                durations = list(pool.map(create, singletons))
 
-        return instance
+        # services with multiple bindings get total time of all of them
+        for plan, duration in zip(singletons, durations):
+            service = plan.binding.service
+            timings[service] = timings.get(service, 0.0) + duration
 
-    def _call_interceptors(self, service: Any, instance: Any) -> None:
-        if service not in self._interceptors:
-            return
+        return timings
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Stores reflection results of every service reachable from the
+        bindings in a file, so other processes can skip reflection
+        with ``load_snapshot()``.
+
+        Services which can't be imported by their qualified name (e.g.
+        classes defined inside functions) are skipped.
+
+        :returns: number of stored entries
+        """
+        from .snapshot import Snapshot
+
+        snapshot = Snapshot()
+        for service in self.validate().order:
+            plan = self._plans.get(service) or self._plan(service)
+            target = plan.target
+            if isinstance(target, WeakTarget):
+                target = target._ref()
+
+            if target is not None:
+                snapshot.add(target, Inspection.inspect(target))
+
+        snapshot.save(path)
+        return len(snapshot)
+
+    def load_snapshot(self, path: str) -> bool:
+        """
+        Loads reflection results stored by ``save_snapshot()``.
+
+        Entries of modules modified since then are ignored. Missing or
+        invalid file is ignored too, so live reflection is used.
+
+        :returns: if snapshot was loaded
+        """
+        from .snapshot import Snapshot
+
+        try:
+            self._snapshot = Snapshot.load(path)
+        except (OSError, ValueError, LookupError, TypeError):
+            return False
+
+        return True
+
+    def freeze(self) -> "Kernel":
+        """
+        Makes the kernel read-only and prepares it for production use.
+
+        Configuration is validated and every service reachable from the
+        bindings is compiled upfront, so ``get()`` is served by a single
+        dict lookup. Changing configuration afterwards raises
+        ``KernelIsFrozen``.
+
+        :raises MissingBinding: when some dependency can't be resolved
+        :raises CircularDependency: when services depend on each other
+        :raises CaptiveDependency: when singleton or pooled service depends
+            on scoped service
+        """
+        if self._frozen:
+            return self
+
+        report = self.validate()
+        report.raise_for_problems()
+        for service in report.order:
+            self.compile(service)
+
+        self._frozen = True
+        return self
+
+    def _ensure_not_frozen(self) -> None:
+        if self._frozen:
+            raise KernelIsFrozen("Kernel configuration can't be changed after freeze()")
+
+    def _recompile(self) -> None:
+        """
+        Compiles again every service which has been compiled already.
+        """
+        services = list(self._compiled)
+        self._version += 1
+        self._compiled.clear()
+        for service in services:
+            self.compile(service)
+
+    def _copy_on_write(self, service: Any) -> None:
+        """
+        Gives the kernel its own copy of configuration shared by ``child()``
+        before it's changed.
+
+        :param service: service which is going to change
+        """
+        if self._shares_singletons:
+            if self._inherited is None:
+                # singletons are checked when requested for the first time,
+                # so overriding a service doesn't walk all of them
+                self._inherited = self._singleton
+                self._singleton = OrderedDict()
+            else:
+                # only ones created since the previous override, which
+                # must be checked before bindings change
+                memo: Dict[Any, bool] = {}
+                self._singleton = OrderedDict(
+                    (binding, instance)
+                    for binding, instance in list(self._singleton.items())
+                    if not self._depends_on(binding, service, memo)
+                )
+
+            self._singleton_pending = {}
+            self._singleton_waits = {}
+            self._singleton_locks_guard = threading.Lock()
+            self._shares_singletons = False
+
+        if self._inherited is not None:
+            # list may be shared with children
+            self._overridden = [*self._overridden, service]
+            self._overridden_memo = {}
+
+        if not self._shared:
+            return
+
+        # lists are replaced (not changed) by bind() etc., so they are shared
+        self._bindings = DefaultDict(list, self._bindings)
+        self._interceptors = DefaultDict(list, self._interceptors)
+        # plans which are not affected by the change stay valid
+        self._plans = dict(self._plans)
+        self._multi_plans = dict(self._multi_plans)
+        self._implicit_plans = weakref.WeakKeyDictionary(self._implicit_plans)
+        self._shared = False
+
+    def _depends_on(
+        self, binding: Binding, service: Any, memo: Dict[Any, bool]
+    ) -> bool:
+        """
+        Checks if instance of a binding could be affected by changing
+        given service (when in doubt it's assumed it could).
+
+        :param memo: results for already checked dependencies
+        """
+        if service in getattr(binding.service, "__mro__", (binding.service,)):
+            return True
+
+        plan = self._plans.get(binding.service)
+        if plan is not None and plan.binding is binding:
+            return self._reaches(plan, service, memo, set(), [])
+
+        for plan in self._all_plans(binding.service):
+            if plan.binding is binding:
+                return self._reaches(plan, service, memo, set(), [])
+
+        return True
+
+    def _reaches(
+        self,
+        plan: Plan,
+        service: Any,
+        memo: Dict[Any, bool],
+        visiting: Set[Any],
+        cycles: List[Any],
+    ) -> bool:
+        """
+        Checks if creating an instance according to the plan can involve
+        given service (or its subclass), directly or through dependencies.
+
+        :param visiting: dependencies which are being checked right now
+        :param cycles: dependencies found while they were being checked
+            (e.g. through ``Provider``), results depending on them are
+            not final, so they aren't memoized
+        """
+        if plan.binding.instance is not None:
+            return False
+
+        if plan.target is None:
+            used = [plan.to]
+        elif any(dep.hint == service for dep in plan.dependencies):
+            # e.g. optional dependency which wasn't bound
+            return True
+        else:
+            used = [dep.service for dep in plan.dependencies if dep.service is not None]
+            if plan.to is not None:
+                # class created directly for ``to=`` binding
+                used.append(plan.to)
+
+        for dependency in used:
+            result = memo.get(dependency)
+            if result is None:
+                if dependency in visiting:
+                    # its result is decided by the check in progress
+                    cycles.append(dependency)
+                    continue
+
+                found = len(cycles)
+                visiting.add(dependency)
+                try:
+                    result = self._involves(
+                        dependency, service, memo, visiting, cycles
+                    )
+                finally:
+                    visiting.discard(dependency)
+
+                if result or len(cycles) == found:
+                    memo[dependency] = result
+
+            if result:
+                return True
+
+        return False
+
+    def _involves(
+        self,
+        dependency: Any,
+        service: Any,
+        memo: Dict[Any, bool],
+        visiting: Set[Any],
+        cycles: List[Any],
+    ) -> bool:
+        if service in getattr(dependency, "__mro__", (dependency,)):
+            return True
+
+        try:
+            plans = self._service_plans(dependency)
+        except Exception:
+            return True
+
+        return any(
+            self._reaches(plan, service, memo, visiting, cycles) for plan in plans
+        )
+
+    def _invalidate(
+        self, service: Any, bound: bool = False, intercepted: bool = False
+    ) -> None:
+        """
+        Drops everything computed from configuration of a changed service.
+
+        Plans refer to their dependencies by service, so only plans of the
+        service itself are dropped, plus plans which decided how to inject
+        the service when it wasn't bound.
+
+        :param bound: service has just been bound for the first time
+        :param intercepted: interceptors of the service changed, which
+            affects its subclasses too
+        """
+        self._version += 1
+        if self._compiled:
+            self._compiled.clear()
+        if self._acyclic:
+            self._acyclic.clear()
+
+        # e.g. while modules are installed
+        if not (self._plans or self._multi_plans or self._implicit_plans):
+            return
+
+        stale = _subclasses(service) if intercepted else [service]
+        if intercepted:
+            # plans creating the classes directly for ``to=`` bindings
+            classes = set(stale)
+            stale.extend(self._find_plans(lambda plan: plan.to in classes))
+
+        if bound and (
+            service in self._unbound_hints or not _weakly_referable(service)
+        ):
+            stale.extend(self._find_plans(lambda plan: _injects(plan, service)))
+
+        for key in stale:
+            self._plans.pop(key, None)
+            self._multi_plans.pop(key, None)
+            if self._implicit_plans:
+                try:
+                    self._implicit_plans.pop(key, None)
+                except TypeError:
+                    # can't be referenced weakly, so it's not there
+                    pass
+
+    def _find_plans(self, predicate: Callable[[Plan], bool]) -> List[Any]:
+        """
+        Returns services which have any cached plan matching the predicate.
+        """
+        found: List[Any] = []
+        for plans in (self._plans, self._implicit_plans):
+            found.extend(key for key, plan in list(plans.items()) if predicate(plan))
+
+        found.extend(
+            key
+            for key, multi in self._multi_plans.items()
+            if any(predicate(plan) for plan in multi)
+        )
+        return found
+
+    def _get(self, interface: Type[T], scope: Scope = None) -> T:
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._plan(interface)
+
+        return self._resolve(plan, scope)
+
+    def _get_all(self, interface: Type[T], scope: Scope = None) -> List[T]:
+        return [self._resolve(plan, scope) for plan in self._all_plans(interface)]
+
+    def _resolve(self, plan: Plan, scope: Optional[Scope] = None) -> Any:
+        """
+        Returns instance for a plan, reusing it according to the lifetime.
+        """
+        binding = plan.binding
+        if binding.instance is not None:
+            return binding.instance
+
+        cache: Optional[Dict[Any, Any]] = None
+
+        if binding.lifetime is Lifetime.singleton:
+            cache = self._singleton
+        elif binding.lifetime is Lifetime.scoped:
+            if scope is None:
+                # attempted to use scoped binding but no scope is active
+                raise BindingIsScoped()
+
+            if binding.scope_level is not None:
+                scope = self._level_scope(binding, scope)
+
+            cache = scope._instances
+        elif binding.lifetime is Lifetime.pooled:
+            if scope is None:
+                raise BindingIsScoped()
+
+            if binding.scope_level is not None:
+                scope = self._level_scope(binding, scope)
+
+            try:
+                return scope._instances[binding]
+            except KeyError:
+                pool = self._pool(binding)
+                instance = pool.acquire(lambda: self._create(plan, scope))
+                scope._pooled.append((pool, instance))
+                scope._instances[binding] = instance
+                return instance
+
+        if cache is None:
+            return self._create(plan, scope)
+
+        try:
+            return cache[binding]
+        except KeyError:
+            pass
+
+        if cache is not self._singleton:
+            assert scope is not None
+            instance = cache[binding] = self._create(plan, scope)
+            if self._builds(plan):
+                scope._own(instance)
+
+            return instance
+
+        return self._create_singleton(plan, scope)
+
+    def _builds(self, plan: Plan) -> bool:
+        """
+        Checks if resolving the plan creates a new instance, instead of
+        reusing one kept by another binding (singleton, ``instance=`` etc.)
+        through ``to=`` bindings.
+        """
+        while plan.target is None:
+            plan = self._plans.get(plan.to) or self._plan(plan.to)
+            binding = plan.binding
+            if (
+                binding.instance is not None
+                or binding.lifetime is not Lifetime.transient
+            ):
+                return False
+
+        return True
+
+    @staticmethod
+    def _level_scope(binding: Binding, scope: Scope) -> Scope:
+        """
+        Returns scope which keeps instances of a binding with ``scope_level``.
+        """
+        try:
+            return scope._levels[binding.scope_level]
+        except KeyError:
+            raise BindingIsScoped(
+                f"{binding.service!r} requires scope {binding.scope_level!r}"
+            ) from None
+
+    def _observed_get(self, interface: Type[T], scope: Scope = None) -> T:
+        """
+        Version of ``_get()`` used when there are observers attached.
+        """
+        event = self._resolve_event(interface, scope)
+        for observer in self._observers:
+            observer.resolve_started(event)
+
+        error = None
+        start = time.perf_counter()
+        try:
+            return Kernel._get(self, interface, scope)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self._notify_finished(event, time.perf_counter() - start, error)
+
+    async def _observed_aget(
+        self,
+        interface: Type[T],
+        scope: Optional[Scope] = None,
+        limit: "Optional[asyncio.Semaphore]" = None,
+    ) -> T:
+        event = self._resolve_event(interface, scope)
+        for observer in self._observers:
+            observer.resolve_started(event)
+
+        error = None
+        start = time.perf_counter()
+        try:
+            return await Kernel._aget(self, interface, scope, limit)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self._notify_finished(event, time.perf_counter() - start, error)
+
+    def _resolve_event(self, interface: Any, scope: Optional[Scope]) -> "ResolveEvent":
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._plan(interface)
+
+        binding = plan.binding
+        if binding.instance is not None:
+            cached = True
+        elif binding.lifetime is Lifetime.singleton:
+            cached = binding in self._singleton
+        elif binding.lifetime is Lifetime.transient:
+            cached = False
+        else:
+            if scope is not None and binding.scope_level is not None:
+                scope = scope._levels.get(binding.scope_level)
+
+            cached = scope is not None and binding in scope._instances
+
+        from .instrumentation import ResolveEvent
+
+        return ResolveEvent(
+            service=interface, lifetime=binding.lifetime, cached=cached, scope=scope
+        )
+
+    def _notify_finished(
+        self, event: "ResolveEvent", duration: float, error: Optional[BaseException]
+    ) -> None:
+        import attr
+
+        event = attr.evolve(event, duration=duration, error=error)
+        for observer in self._observers:
+            observer.resolve_finished(event)
+
+    def _create_singleton(self, plan: Plan, scope: Optional[Scope]) -> Any:
+        """
+        Creates singleton instance, making sure it's created only once.
+
+        Threads (and ``aget()`` calls) requesting a singleton which is being
+        created wait for that construction. Unrelated singletons can be
+        created concurrently.
+        """
+        binding = plan.binding
+        while True:
+            construction, owner = self._start_construction(binding, False)
+            if construction is None:
+                return self._singleton[binding]
+
+            if not owner:
+                if construction.thread == threading.get_ident():
+                    # waiting would never end
+                    if construction.is_async:
+                        raise BindingIsAsync(
+                            f"{binding.service!r} is being created by aget()"
+                        )
+
+                    raise CircularDependency(f"{binding.service!r} depends on itself")
+
+                instance = self._wait_for(binding, construction)
+                if instance is _FAILED:
+                    continue
+
+                return instance
+
+            try:
+                instance = self._create(plan, scope)
+            except BaseException:
+                self._fail_construction(binding, construction)
+                raise
+
+            return self._store_singleton(binding, construction, instance)
+
+    def _start_construction(
+        self, binding: Binding, is_async: bool
+    ) -> Tuple[Optional[Construction], bool]:
+        """
+        Returns construction of a singleton which is in progress or a new
+        one, in that case caller is responsible for creating the instance.
+
+        ``None`` is returned if the singleton has been created already.
+        """
+        if self._inherited is not None and self._inherit(binding):
+            return None, False
+
+        with self._singleton_locks_guard:
+            if binding in self._singleton:
+                return None, False
+
+            construction = self._singleton_pending.get(binding)
+            if construction is not None:
+                return construction, False
+
+            construction = self._singleton_pending[binding] = Construction(is_async)
+            return construction, True
+
+    def _inherit(self, binding: Binding) -> bool:
+        """
+        Reuses singleton shared before configuration changed, unless it
+        could depend on one of the services overridden since then.
+        """
+        assert self._inherited is not None
+        try:
+            instance = self._inherited[binding]
+        except KeyError:
+            return False
+
+        for service in self._overridden:
+            memo = self._overridden_memo.setdefault(service, {})
+            if self._depends_on(binding, service, memo):
+                return False
+
+        with self._singleton_locks_guard:
+            self._singleton.setdefault(binding, instance)
+
+        return True
+
+    def _wait_for(self, binding: Binding, construction: Construction) -> Any:
+        """
+        Blocks until construction started by another thread finishes.
+
+        :raises CircularDependency: when that thread (directly or through
+            other threads) waits for a singleton this one is creating
+        """
+        current = threading.get_ident()
+        # kernel can get its own copies in the meantime (see ``child()``)
+        waits, guard = self._singleton_waits, self._singleton_locks_guard
+        with guard:
+            thread = construction.thread
+            seen: Set[int] = set()
+            while thread not in seen:
+                if thread == current:
+                    raise CircularDependency(
+                        f"{binding.service!r} depends on itself"
+                    )
+
+                seen.add(thread)
+                waiting = waits.get(thread)
+                if waiting is None:
+                    break
+
+                thread = waiting.thread
+
+            waits[current] = construction
+
+        try:
+            return construction.future.result()
+        finally:
+            with guard:
+                del waits[current]
+
+    def _store_singleton(
+        self, binding: Binding, construction: Construction, instance: Any
+    ) -> Any:
+        with self._singleton_locks_guard:
+            self._singleton[binding] = instance
+            self._singleton_pending.pop(binding, None)
+
+        construction.future.set_result(instance)
+        return instance
+
+    def _fail_construction(self, binding: Binding, construction: Construction) -> None:
+        with self._singleton_locks_guard:
+            self._singleton_pending.pop(binding, None)
+
+        # waiting callers try to create the instance on their own
+        construction.future.set_result(_FAILED)
+
+    def _create(self, plan: Plan, scope: Optional[Scope]) -> Any:
+        """
+        Creates a new instance according to the plan (ignoring caches).
+        """
+        if plan.target is None:
+            # instance bindings are never created
+            assert plan.to is not None
+            instance = self._get(plan.to, scope=scope)
+        else:
+            if plan.is_async:
+                raise BindingIsAsync(
+                    f"{plan.binding.service!r} has async factory, use aget() instead"
+                )
+
+            arguments: Dict[str, Any] = {}
+            for dep in plan.dependencies:
+                if dep.service is None:
+                    arguments[dep.name] = None
+                elif dep.collection is not None:
+                    arguments[dep.name] = dep.collection(
+                        self._get_all(dep.service, scope=scope)
+                    )
+                elif dep.deferred is not None:
+                    arguments[dep.name] = dep.deferred(
+                        self._owner(plan, scope), dep.service
+                    )
+                else:
+                    arguments[dep.name] = self._get(dep.service, scope=scope)
+
+            instance = plan.target(**arguments)
+
+        if plan.interceptor is not None:
+            instance = plan.interceptor(instance)
+
+        return instance
+
+    async def _aget(
+        self,
+        interface: Type[T],
+        scope: Optional[Scope] = None,
+        limit: "Optional[asyncio.Semaphore]" = None,
+    ) -> T:
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._plan(interface)
+
+        return await self._aresolve(plan, scope, limit)
+
+    async def _aget_all(
+        self,
+        interface: Type[T],
+        scope: Optional[Scope] = None,
+        limit: "Optional[asyncio.Semaphore]" = None,
+    ) -> List[T]:
+        plans = self._all_plans(interface)
+        if len(plans) > 1:
+            self._check_acyclic([interface])
+
+        return await _gather([self._aresolve(plan, scope, limit) for plan in plans])
+
+    async def _acollect(
+        self,
+        dependency: Dependency,
+        scope: Optional[Scope],
+        limit: "Optional[asyncio.Semaphore]",
+    ) -> Any:
+        assert dependency.collection is not None and dependency.service is not None
+        instances = await self._aget_all(dependency.service, scope, limit)
+        return dependency.collection(instances)
+
+    async def _aresolve(
+        self,
+        plan: Plan,
+        scope: Optional[Scope] = None,
+        limit: "Optional[asyncio.Semaphore]" = None,
+    ) -> Any:
+        binding = plan.binding
+        if binding.instance is not None:
+            return binding.instance
+
+        if binding.lifetime is Lifetime.singleton:
+            try:
+                return self._singleton[binding]
+            except KeyError:
+                return await self._acreate_singleton(plan, scope, limit)
+        elif binding.lifetime is Lifetime.scoped:
+            if scope is None:
+                # attempted to use scoped binding but no scope is active
+                raise BindingIsScoped()
+
+            if binding.scope_level is not None:
+                scope = self._level_scope(binding, scope)
+
+            try:
+                return scope._instances[binding]
+            except KeyError:
+                return await self._acreate_scoped(plan, scope, limit)
+        elif binding.lifetime is Lifetime.pooled:
+            if scope is None:
+                raise BindingIsScoped()
+
+            if binding.scope_level is not None:
+                scope = self._level_scope(binding, scope)
+
+            try:
+                return scope._instances[binding]
+            except KeyError:
+                return await self._acreate_pooled(plan, scope, limit)
+        else:
+            return await self._acreate(plan, scope, limit)
+
+    async def _acreate_singleton(
+        self,
+        plan: Plan,
+        scope: Optional[Scope],
+        limit: "Optional[asyncio.Semaphore]",
+    ) -> Any:
+        """
+        Creates singleton instance without blocking the event loop.
+
+        Construction is shared with concurrent tasks, other event loops
+        and threads calling ``get()``, so the instance is created once.
+        """
+        import asyncio
+
+        binding = plan.binding
+        token = _start_building(binding)
+        try:
+            while True:
+                construction, owner = self._start_construction(binding, True)
+                if construction is None:
+                    return self._singleton[binding]
+
+                if not owner:
+                    if construction.thread == threading.get_ident() and (
+                        not construction.is_async
+                    ):
+                        raise CircularDependency(
+                            f"{binding.service!r} depends on itself"
+                        )
+
+                    instance = await asyncio.wrap_future(construction.future)
+                    if instance is _FAILED:
+                        continue
+
+                    return instance
+
+                try:
+                    instance = await self._acreate(plan, scope, limit)
+                except BaseException:
+                    self._fail_construction(binding, construction)
+                    raise
+
+                return self._store_singleton(binding, construction, instance)
+        finally:
+            _building.reset(token)
+
+    async def _acreate_scoped(
+        self, plan: Plan, scope: Scope, limit: "Optional[asyncio.Semaphore]"
+    ) -> Any:
+        """
+        Creates scoped instance without blocking the event loop.
+
+        Concurrent tasks requesting the same instance wait for a single
+        construction instead of creating their own instances.
+        """
+        binding = plan.binding
+        lock = scope._async_locks.get(binding)
+        if lock is None:
+            import asyncio
+
+            lock = scope._async_locks[binding] = asyncio.Lock()
+
+        # lock isn't reentrant
+        token = _start_building(binding)
+        try:
+            async with lock:
+                if binding in scope._instances:
+                    return scope._instances[binding]
+
+                instance = await self._acreate(plan, scope, limit)
+                scope._instances[binding] = instance
+                scope._async_locks.pop(binding, None)
+                if self._builds(plan):
+                    scope._own(instance)
+        finally:
+            _building.reset(token)
+
+        return instance
+
+    async def _acreate_pooled(
+        self, plan: Plan, scope: Scope, limit: "Optional[asyncio.Semaphore]"
+    ) -> Any:
+        binding = plan.binding
+        lock = scope._async_locks.get(binding)
+        if lock is None:
+            import asyncio
+
+            lock = scope._async_locks[binding] = asyncio.Lock()
+
+        token = _start_building(binding)
+        try:
+            async with lock:
+                if binding in scope._instances:
+                    return scope._instances[binding]
+
+                pool = self._pool(binding)
+                instance = await pool.aacquire(
+                    lambda: self._acreate(plan, scope, limit)
+                )
+                scope._pooled.append((pool, instance))
+                scope._instances[binding] = instance
+                scope._async_locks.pop(binding, None)
+        finally:
+            _building.reset(token)
+
+        return instance
+
+    def _check_acyclic(self, services: Iterable[Any]) -> None:
+        """
+        Checks that services can be created without a dependency cycle.
+
+        Dependencies resolved by concurrent tasks don't see each other's
+        construction, so waiting for a cycle among them would never end.
+        Results are kept until configuration changes.
+
+        :raises CircularDependency: when some service depends on itself
+        """
+        for service in services:
+            if service not in self._acyclic:
+                self._visit_acyclic(service, [])
+
+    def _visit_acyclic(self, service: Any, path: List[Any]) -> None:
+        if service in path:
+            raise CircularDependency(f"{service!r} depends on itself")
+
+        try:
+            plans = self._service_plans(service)
+        except Exception:
+            # resolution itself reports the error
+            return
+
+        path.append(service)
+        for plan in plans:
+            if plan.binding.instance is not None:
+                continue
+
+            if plan.target is None:
+                used = [plan.to]
+            else:
+                used = [
+                    dep.service
+                    for dep in plan.dependencies
+                    if dep.service is not None and dep.deferred is None
+                ]
+
+            for dependency in used:
+                if dependency not in self._acyclic:
+                    self._visit_acyclic(dependency, path)
+
+        path.pop()
+        if _weakly_referable(service):
+            self._acyclic.add(service)
+
+    def _pool(self, binding: Binding) -> "Pool":
+        """
+        Returns pool for pooled binding, creating it when necessary.
+        """
+        with self._pools_guard:
+            pool = self._pools.get(binding)
+            if pool is None:
+                from .pool import Pool
+
+                assert binding.pool_size is not None
+                pool = self._pools[binding] = Pool(
+                    binding.pool_size, binding.pool_timeout
+                )
+
+        return pool
+
+    async def _acreate(
+        self,
+        plan: Plan,
+        scope: Optional[Scope],
+        limit: "Optional[asyncio.Semaphore]",
+    ) -> Any:
+        """
+        Async version of ``_create()``.
+
+        Dependencies are independent from each other, so they are
+        resolved concurrently.
+        """
+        if plan.target is None:
+            assert plan.to is not None
+            instance = await self._aget(plan.to, scope, limit)
+        else:
+            arguments = {
+                dep.name: None
+                if dep.deferred is None
+                else dep.deferred(self._owner(plan, scope), dep.service)
+                for dep in plan.dependencies
+            }
+            resolved = [
+                dep
+                for dep in plan.dependencies
+                if dep.service is not None and dep.deferred is None
+            ]
+            if len(resolved) > 1:
+                # each one is resolved by its own task
+                self._check_acyclic(dep.service for dep in resolved)
+
+            names: List[str] = []
+            awaitables: List[Awaitable[Any]] = []
+            for dep in resolved:
+                names.append(dep.name)
+                awaitables.append(
+                    self._aget(dep.service, scope, limit)
+                    if dep.collection is None
+                    else self._acollect(dep, scope, limit)
+                )
+
+            if awaitables:
+                arguments.update(zip(names, await _gather(awaitables)))
+
+            if not plan.is_async:
+                instance = plan.target(**arguments)
+            elif limit is None:
+                instance = await plan.target(**arguments)
+            else:
+                async with limit:
+                    instance = await plan.target(**arguments)
+
+        if plan.interceptor is not None:
+            instance = plan.interceptor(instance)
+
+        return instance
+
+    def _plan(self, interface: Any) -> Plan:
+        """
+        Returns resolution plan for a service which is not in ``_plans``.
+
+        Plans for bound services are stored in ``_plans``. Classes which
+        are not bound (auto-wired) get their plans stored separately in
+        a bounded cache which doesn't keep them alive, so reading never
+        makes the explicit bindings grow.
+        """
+        try:
+            plan = self._implicit_plans.get(interface)
+        except TypeError:
+            # can't be referenced weakly, so it's not a class
+            plan = None
+            weak = False
+        else:
+            if plan is not None:
+                return plan
+
+            weak = True
+
+        bindings = self._bindings.get(interface)
+        if bindings:
+            plan = self._plans[interface] = self._build_plan(interface, bindings[-1])
+        elif not weak:
+            plan = self._plans[interface] = self._build_plan(
+                interface, Binding(interface)
+            )
+        else:
+            ref = weakref.ref(interface)
+            plan = self._build_plan(
+                interface, Binding(service=ref), target=WeakTarget(ref)
+            )
+            if len(self._implicit_plans) >= self.implicit_plans_limit:
+                self._implicit_plans.clear()
+
+            self._implicit_plans[interface] = plan
+
+        return plan
+
+    def _owner(self, plan: Plan, scope: Optional[Scope]) -> "Union[Kernel, Scope]":
+        """
+        Returns what should resolve deferred dependencies of an instance.
+
+        Singletons outlive scopes, so they never capture one.
+        """
+        if scope is None or plan.binding.lifetime is Lifetime.singleton:
+            return self
+
+        return scope
+
+    def _all_plans(self, interface: Any) -> Tuple[Plan, ...]:
+        """
+        Returns plans of every binding of a service, in registration order.
+        """
+        plans = self._multi_plans.get(interface)
+        if plans is None:
+            bindings = self._bindings.get(interface)
+            if not bindings:
+                # not cached, so services which aren't bound aren't kept alive
+                return ()
+
+            plans = self._multi_plans[interface] = tuple(
+                self._build_plan(interface, binding) for binding in bindings
+            )
+
+        return plans
+
+    def _service_plans(self, service: Any) -> Tuple[Plan, ...]:
+        """
+        Returns plans of every binding of a service (or the auto-wiring plan
+        if it's not bound).
+        """
+        bindings = self._bindings.get(service)
+        if bindings and len(bindings) > 1:
+            return self._all_plans(service)
+
+        return (self._plans.get(service) or self._plan(service),)
+
+    def _build_plan(
+        self, service: Any, binding: Binding, target: Callable = None
+    ) -> Plan:
+        """
+        Creates plan for a binding of given service.
+
+        :param target: callable which creates the instance, by default it's
+            the factory or the service itself
+        """
+        if binding.instance is not None:
+            return Plan(binding)
+
+        if binding.to is not None:
+            to = self._import(binding.to)
+            if not self._creates_directly(service, to):
+                return Plan(
+                    binding, to=to, interceptor=self._interceptor(service, to)
+                )
+
+            self._unbound(to)
+            inspected = to
+        else:
+            to = None
+            inspected = self._import(binding.factory or service)
+
+        inspection = self._inspect(inspected)
+        return Plan(
+            binding,
+            target=target or inspected,
+            to=to,
+            dependencies=tuple(
+                self._dependency(param.name, param.hint, param.has_default)
+                for param in inspection.parameters
+                if param.hint is not None
+            ),
+            is_async=inspect.iscoroutinefunction(inspected),
+            interceptor=self._interceptor(service, created=to),
+        )
+
+    def _creates_directly(self, service: Any, to: Any) -> bool:
+        """
+        Checks if ``to=`` binding should create the class itself instead of
+        resolving it, so interceptors of the service (which the class
+        inherits from) can replace the instance.
+
+        It's only possible for classes which aren't bound, as their plans
+        don't have to be shared with other services.
+        """
+        if not self._interceptors or not isinstance(to, type) or to in self._bindings:
+            return False
+
+        shared = getattr(service, "__mro__", (service,))
+        return any(
+            key in self._interceptors for key in to.__mro__ if key in shared
+        )
+
+    def _interceptor(
+        self, service: Any, to: Any = None, created: Any = None
+    ) -> Optional[Callable[[Any], Any]]:
+        """
+        Returns interceptors of a service and its base classes fused into one
+        callable, most specific class first.
+
+        Interceptors of a base class which return an instance of another class
+        (according to their return type) are only used by plans of the class
+        they are registered for and of services bound ``to=`` it, so e.g.
+        ``get(InMemoryFileSystem)`` never returns a ``CountingFileSystem``
+        wrapper.
+
+        :param to: service the instance is taken from, interceptors applied
+            by its plan (including ones of shared base classes) are skipped
+        :param created: class created for the service (for ``to=`` bindings
+            of classes which aren't bound), its interceptors apply too
+        """
+        if not self._interceptors:
+            return None
+
+        keys: List[Any] = list(getattr(created, "__mro__", ()))
+        for key in getattr(service, "__mro__", (service,)):
+            if key not in keys:
+                keys.append(key)
+
+        skip = () if to is None else getattr(to, "__mro__", (to,))
+        checkable = _checkable(service)
+        handlers: List[Tuple[Callable, bool]] = []
+        for key in keys:
+            for handler in self._interceptors.get(key, ()):
+                if key in skip and (
+                    key is to or _compatible(handler, to) is not False
+                ):
+                    continue
+
+                if key is service or not checkable:
+                    handlers.append((handler, False))
+                    continue
+
+                compatible = _compatible(handler, service)
+                if compatible is not False:
+                    handlers.append((handler, compatible is None))
+
+        return _chain(tuple(handlers), service)
+
+    def _import(self, target: Any) -> Any:
+        """
+        Returns object pointed by a lazy reference (other values as they are).
+        """
+        if not isinstance(target, str):
+            return target
+
+        try:
+            return self._references[target]
+        except KeyError:
+            pass
+
+        start = time.perf_counter()
+        from .imports import import_reference
+
+        obj = self._references[target] = import_reference(target)
+        self._import_times[target] = time.perf_counter() - start
+        return obj
+
+    def _inspect(self, obj: Any) -> Inspection:
+        if self._snapshot is not None:
+            inspection = self._snapshot.get(obj)
+            if inspection is not None:
+                return inspection
+
+        return Inspection.inspect(obj)
+
+    def _unbound(self, hint: Any) -> None:
+        """
+        Remembers hint which would be injected differently if it was bound.
+        """
+        if _weakly_referable(hint):
+            self._unbound_hints.add(hint)
+
+    def _dependency(self, name: str, hint: Any, has_default: bool) -> Dependency:
+        if hint in self._bindings:
+            return Dependency(name, hint, hint=hint)
+
+        origin = getattr(hint, "__origin__", None)
+        if origin is Provider or origin is Lazy:
+            self._unbound(hint)
+            return Dependency(name, hint.__args__[0], deferred=origin, hint=hint)
+
+        item, collection = strip_collection(hint)
+        if collection is not None:
+            self._unbound(hint)
+            return Dependency(name, item, collection=collection, hint=hint)
+
+        if has_default:
+            self._unbound(hint)
+            return Dependency(name, None, hint=hint)
 
-        for handler in self._interceptors[service]:
-            handler(instance)
+        return Dependency(name, hint, hint=hint)
@@ -1,44 +1,81 @@
 """
 Modular configuration for container.
 """
-import inspect
-from typing import Any, Callable, TypeVar, Union, get_type_hints
-
-import attr
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Tuple,
+    TypeVar,
+    Union,
+    get_type_hints,
+)
 
 from .reflection import Inspection
 from .types import AbstractModule, Binder, Lifetime
+from .utils import slots_repr
 
 T = TypeVar("T")
 TFn = TypeVar("TFn", bound=Callable)
 INFO_ATTRIB_NAME = "__injectpy__info__"
 
 
-@attr.dataclass()
 class FactoryInfo:
-    service: Any
-    lifetime: Lifetime
+    __slots__ = ("service", "lifetime", "pool_size", "pool_timeout", "scope_level")
+
+    def __init__(
+        self,
+        service: Any,
+        lifetime: Lifetime,
+        pool_size: int = None,
+        pool_timeout: float = None,
+        scope_level: Any = None,
+    ) -> None:
+        self.service = service
+        self.lifetime = lifetime
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.scope_level = scope_level
+
+    __repr__ = slots_repr
 
 
-@attr.dataclass()
 class InterceptInfo:
-    service: Any
+    __slots__ = ("service",)
+
+    def __init__(self, service: Any) -> None:
+        self.service = service
 
+    __repr__ = slots_repr
 
-def factory(*, lifetime: Lifetime = Lifetime.transient) -> Callable[[TFn], TFn]:
+
+def factory(
+    *,
+    lifetime: Lifetime = Lifetime.transient,
+    pool_size: int = None,
+    pool_timeout: float = None,
+    scope_level: Any = None,
+) -> Callable[[TFn], TFn]:
     """
     Marks method of a Module as a factory function.
     """
 
     def decorator(fn: TFn) -> TFn:
-        info = FactoryInfo(service=get_returned_type(fn), lifetime=lifetime)
+        info = FactoryInfo(
+            service=get_returned_type(fn),
+            lifetime=lifetime,
+            pool_size=pool_size,
+            pool_timeout=pool_timeout,
+            scope_level=scope_level,
+        )
         setattr(fn, INFO_ATTRIB_NAME, info)
         return fn
 
     return decorator
 
 
-TInterceptHandler = TypeVar("TInterceptHandler", bound=Callable[[Any, Any], None])
+TInterceptHandler = TypeVar("TInterceptHandler", bound=Callable[[Any, Any], Any])
 
 
 def intercept() -> Callable[[TInterceptHandler], TInterceptHandler]:
@@ -73,14 +110,49 @@ def get_first_hint(cb: Callable) -> Any:
         raise RuntimeError(f"'{cb.__name__}' has no first positional argument")
 
 
+Manifest = Tuple[Tuple[str, Union[FactoryInfo, InterceptInfo]], ...]
+
+
+def collect_manifest(cls: type) -> Manifest:
+    """
+    Returns names of factories and interceptors of a module class
+    (sorted by name) with their info.
+    """
+    members: Dict[str, Any] = {}
+    for klass in reversed(cls.__mro__):
+        members.update(vars(klass))
+
+    manifest = []
+    for name in sorted(members):
+        value = members[name]
+        info = getattr(value, INFO_ATTRIB_NAME, None) if callable(value) else None
+        if isinstance(info, (FactoryInfo, InterceptInfo)):
+            manifest.append((name, info))
+
+    return tuple(manifest)
+
+
 class Module(AbstractModule):
+    #: factories and interceptors of the class, collected when it's defined
+    _manifest: ClassVar[Manifest] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls._manifest = collect_manifest(cls)
+
     def install_module(self, binder: Binder) -> None:
-        info: Union[FactoryInfo, InterceptInfo, None]
-        for _, meth in inspect.getmembers(self, inspect.ismethod):
-            info = getattr(meth, INFO_ATTRIB_NAME, None)
+        for name, info in self._manifest:
+            meth = getattr(self, name)
             if isinstance(info, FactoryInfo):
-                binder.bind(info.service, factory=meth, lifetime=info.lifetime)
-            elif isinstance(info, InterceptInfo):
+                binder.bind(
+                    info.service,
+                    factory=meth,
+                    lifetime=info.lifetime,
+                    pool_size=info.pool_size,
+                    pool_timeout=info.pool_timeout,
+                    scope_level=info.scope_level,
+                )
+            else:
                 binder.intercept(info.service, handler=meth)
 
         self.configure(binder)
@@ -0,0 +1,183 @@
+"""
+Pools of reusable instances for ``Lifetime.pooled`` bindings.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+import attr
+
+from .exceptions import PoolExhausted
+
+#: handed over to async waiter when it should try to create an instance itself
+_RETRY = object()
+
+
+@attr.dataclass(frozen=True)
+class PoolStats:
+    """
+    Snapshot of pool statistics.
+    """
+
+    #: how many times an idle instance was reused
+    hits: int = 0
+    #: how many times a new instance had to be created
+    misses: int = 0
+    #: how many times pool was exhausted and we had to wait for an instance
+    waits: int = 0
+    #: number of instances created by the pool
+    size: int = 0
+    #: number of instances waiting in the pool to be reused
+    idle: int = 0
+
+
+class Pool:
+    """
+    Thread-safe pool of instances with limited size.
+
+    :param max_size: maximum number of instances created by the pool
+    :param timeout: how long to wait for an instance when the pool is
+        exhausted (``None`` - wait forever, ``0`` - fail immediately)
+    """
+
+    def __init__(self, max_size: int, timeout: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: List[Any] = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+
+    def stats(self) -> PoolStats:
+        with self._condition:
+            return PoolStats(
+                hits=self._hits,
+                misses=self._misses,
+                waits=self._waits,
+                size=self._size,
+                idle=len(self._idle),
+            )
+
+    def acquire(self, create: Callable[[], Any]) -> Any:
+        """
+        Returns idle instance or creates a new one using ``create``.
+
+        :raises PoolExhausted: when no instance became available in time
+        """
+        with self._condition:
+            if not self._idle and self._size >= self.max_size:
+                self._waits += 1
+                self._wait()
+
+            if self._idle:
+                self._hits += 1
+                return self._idle.pop()
+
+            self._misses += 1
+            self._size += 1
+
+        return self._create(create)
+
+    async def aacquire(self, create: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of ``acquire()`` which doesn't block the event loop.
+        """
+        while True:
+            with self._condition:
+                if self._idle:
+                    self._hits += 1
+                    return self._idle.pop()
+
+                if self._size < self.max_size:
+                    self._misses += 1
+                    self._size += 1
+                    waiter = None
+                else:
+                    self._waits += 1
+                    if self.timeout == 0:
+                        raise PoolExhausted()
+
+                    loop = asyncio.get_running_loop()
+                    waiter = loop.create_future()
+                    self._async_waiters.append((loop, waiter))
+
+            if waiter is None:
+                try:
+                    return await create()
+                except BaseException:
+                    self._discard()
+                    raise
+
+            try:
+                instance = await asyncio.wait_for(waiter, self.timeout)
+            except asyncio.TimeoutError:
+                raise PoolExhausted() from None
+            finally:
+                with self._condition:
+                    self._async_waiters = [
+                        item for item in self._async_waiters if item[1] is not waiter
+                    ]
+
+            if instance is not _RETRY:
+                return instance
+
+    def release(self, instance: Any) -> None:
+        """
+        Returns instance to the pool.
+        """
+        with self._condition:
+            if self._async_waiters:
+                loop, waiter = self._async_waiters.pop(0)
+                loop.call_soon_threadsafe(self._hand_over, waiter, instance)
+                return
+
+            self._idle.append(instance)
+            self._condition.notify()
+
+    def _hand_over(self, waiter: asyncio.Future, instance: Any) -> None:
+        if not waiter.done():
+            waiter.set_result(instance)
+        elif instance is _RETRY:
+            # waiter gave up in the meantime, wake up somebody else
+            with self._condition:
+                self._wake()
+        else:
+            self.release(instance)
+
+    def _wake(self) -> None:
+        """
+        Lets the next waiter know that it can try to create an instance.
+        """
+        if self._async_waiters:
+            loop, waiter = self._async_waiters.pop(0)
+            loop.call_soon_threadsafe(self._hand_over, waiter, _RETRY)
+        else:
+            self._condition.notify()
+
+    def _wait(self) -> None:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._idle and self._size >= self.max_size:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise PoolExhausted()
+
+            self._condition.wait(remaining)
+
+    def _create(self, create: Callable[[], Any]) -> Any:
+        try:
+            return create()
+        except BaseException:
+            self._discard()
+            raise
+
+    def _discard(self) -> None:
+        """
+        Frees the slot of an instance which failed to be created.
+        """
+        with self._condition:
+            self._size -= 1
+            self._wake()
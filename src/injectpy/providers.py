@@ -0,0 +1,80 @@
+"""
+Deferred injection: ``Provider[T]`` and ``Lazy[T]`` arguments are
+resolved only when the dependency is actually used.
+"""
+import threading
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .kernel import Kernel, Scope
+
+T = TypeVar("T")
+
+#: marks ``Lazy`` which wasn't resolved yet
+_MISSING = object()
+
+
+class Provider(Generic[T]):
+    """
+    Returns an instance of the service every time it's called.
+
+    Instances are resolved by the scope which was active when the provider
+    was injected (or by the kernel if there was none), so lifetimes work
+    the same as with regular injection.
+    """
+
+    __slots__ = ("_owner", "_service")
+
+    def __init__(self, owner: Union["Kernel", "Scope"], service: Any) -> None:
+        self._owner = owner
+        self._service = service
+
+    def __call__(self) -> T:
+        return self._owner.get(self._service)
+
+    async def aget(self) -> T:
+        return await self._owner.aget(self._service)
+
+    def __repr__(self) -> str:
+        name = getattr(self._service, "__qualname__", self._service)
+        return f"Provider[{name}]"
+
+
+class Lazy(Generic[T]):
+    """
+    Resolves the service on first access of ``value`` and reuses it later.
+    """
+
+    __slots__ = ("_owner", "_service", "_value", "_lock")
+
+    def __init__(self, owner: Union["Kernel", "Scope"], service: Any) -> None:
+        self._owner = owner
+        self._service = service
+        self._value: Any = _MISSING
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> T:
+        if self._value is _MISSING:
+            with self._lock:
+                if self._value is _MISSING:
+                    self._value = self._owner.get(self._service)
+
+        return self._value
+
+    async def aget(self) -> T:
+        if self._value is _MISSING:
+            value = await self._owner.aget(self._service)
+            # another task could finish first, keep the first instance
+            if self._value is _MISSING:
+                self._value = value
+
+        return self._value
+
+    @property
+    def resolved(self) -> bool:
+        return self._value is not _MISSING
+
+    def __repr__(self) -> str:
+        name = getattr(self._service, "__qualname__", self._service)
+        return f"Lazy[{name}]"
@@ -1,27 +1,36 @@
 import inspect
 from typing import Any, Dict, List, Optional, get_type_hints
 
-import attr
+from .utils import slots_repr, strip_optional
 
-from .utils import strip_optional
 
-
-@attr.dataclass(frozen=True)
 class Parameter:
     """
     Information about single parameter.
     """
 
-    #: name of the parameter
-    name: str
-    #: if the parameter has a default value set
-    has_default: bool
-    #: resolved type hint (with Optional[] removed)
-    hint: Optional[Any]
-    #: if it was an union of Something and None.
-    is_optional: bool
-    #: parameter kind
-    kind: inspect._ParameterKind
+    __slots__ = ("name", "has_default", "hint", "is_optional", "kind")
+
+    def __init__(
+        self,
+        name: str,
+        has_default: bool,
+        hint: Optional[Any],
+        is_optional: bool,
+        kind: inspect._ParameterKind,
+    ) -> None:
+        #: name of the parameter
+        self.name = name
+        #: if the parameter has a default value set
+        self.has_default = has_default
+        #: resolved type hint (with Optional[] removed)
+        self.hint = hint
+        #: if it was an union of Something and None.
+        self.is_optional = is_optional
+        #: parameter kind
+        self.kind = kind
+
+    __repr__ = slots_repr
 
     @staticmethod
     def create(param: inspect.Parameter, hints: Dict[str, Any]) -> "Parameter":
@@ -43,10 +52,14 @@ class Parameter:
         return self.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
 
 
-@attr.dataclass(frozen=True)
 class Inspection:
-    obj: Any
-    parameters: List[Parameter]
+    __slots__ = ("obj", "parameters")
+
+    def __init__(self, obj: Any, parameters: List[Parameter]) -> None:
+        self.obj = obj
+        self.parameters = parameters
+
+    __repr__ = slots_repr
 
     @staticmethod
     def inspect(obj: Any) -> "Inspection":
@@ -66,3 +79,22 @@ class Inspection:
                 Parameter.create(param, hints) for param in sig.parameters.values()
             ],
         )
+
+
+def returned_type(obj: Any) -> Optional[type]:
+    """
+    Returns class of values returned by a callable (``NoneType`` if it
+    returns nothing), ``None`` if it's not known.
+
+    Classes return their own instances, ``Optional[]`` is ignored.
+    """
+    if inspect.isclass(obj):
+        return obj
+
+    try:
+        hint = get_type_hints(obj).get("return")
+    except Exception:
+        return None
+
+    hint, _ = strip_optional(hint)
+    return hint if isinstance(hint, type) else None
@@ -0,0 +1,180 @@
+"""
+Persisting results of reflection, so a new process doesn't have to repeat
+``get_type_hints()`` and ``inspect.signature()`` for every service.
+
+Only objects which can be found again by their qualified name are stored.
+Entries are checked against modification time and size of the modules
+which define them, stale entries are ignored (live reflection is used).
+"""
+import inspect
+import json
+import os
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from .imports import import_reference
+from .reflection import Inspection, Parameter
+
+#: bump when format of the file changes
+VERSION = 1
+
+
+def reference(obj: Any) -> Optional[str]:
+    """
+    Returns ``"package.module:Name"`` reference to an object (if possible).
+    """
+    module = getattr(obj, "__module__", None)
+    qualname = getattr(obj, "__qualname__", None)
+    if not isinstance(module, str) or not isinstance(qualname, str):
+        return None
+
+    if "<" in qualname or module == "__main__":
+        # defined inside a function, can't be found by name
+        return None
+
+    return f"{module}:{qualname}"
+
+
+def _find(ref: str) -> Any:
+    try:
+        return import_reference(ref)
+    except (ImportError, AttributeError):
+        return None
+
+
+def module_signature(name: str) -> Optional[Tuple[int, int]]:
+    """
+    Returns modification time and size of module's file.
+    """
+    module = sys.modules.get(name)
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return None
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Snapshot:
+    def __init__(self) -> None:
+        #: reference -> modules it depends on and serialized parameters
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._modules: Dict[str, Tuple[int, int]] = {}
+        #: modules checked in this process (``True`` if not modified)
+        self._fresh: Dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, obj: Any, inspection: Inspection) -> bool:
+        """
+        Stores inspection of an object, returns ``False`` if it's not possible.
+        """
+        key = reference(obj)
+        if key is None:
+            return False
+
+        parameters = []
+        for param in inspection.parameters:
+            hint = None
+            if param.hint is not None:
+                hint = reference(param.hint)
+                if hint is None or _find(hint) is not param.hint:
+                    # generic types etc. are not supported
+                    return False
+
+            kind = param.kind.name
+            parameters.append(
+                [param.name, param.has_default, hint, param.is_optional, kind]
+            )
+
+        modules = {obj.__module__}
+        if inspect.isclass(obj):
+            # __init__ can be inherited from (or later added to) any base class
+            modules.update(
+                cls.__module__ for cls in obj.__mro__ if cls.__module__ != "builtins"
+            )
+            init = getattr(obj, "__init__", None)
+            if isinstance(getattr(init, "__module__", None), str):
+                modules.add(init.__module__)
+
+        for module in modules:
+            signature = module_signature(module)
+            if signature is None:
+                return False
+
+            self._modules[module] = signature
+
+        self._entries[key] = {"modules": sorted(modules), "parameters": parameters}
+        return True
+
+    def get(self, obj: Any) -> Optional[Inspection]:
+        """
+        Returns stored inspection of an object, ``None`` if it's missing or stale.
+        """
+        key = reference(obj)
+        entry = self._entries.get(key) if key is not None else None
+        if entry is None or not all(map(self._is_fresh, entry["modules"])):
+            return None
+
+        try:
+            parameters = [
+                Parameter(
+                    name=name,
+                    has_default=has_default,
+                    hint=None if hint is None else import_reference(hint),
+                    is_optional=is_optional,
+                    kind=getattr(inspect.Parameter, kind),
+                )
+                for name, has_default, hint, is_optional, kind in entry["parameters"]
+            ]
+        except (ImportError, AttributeError):
+            return None
+
+        return Inspection(obj, parameters=parameters)
+
+    def _is_fresh(self, module: str) -> bool:
+        fresh = self._fresh.get(module)
+        if fresh is None:
+            expected = self._modules.get(module)
+            fresh = self._fresh[module] = (
+                expected is not None and module_signature(module) == expected
+            )
+
+        return fresh
+
+    def save(self, path: str) -> None:
+        data = {
+            "version": VERSION,
+            "python": list(sys.version_info[:2]),
+            "modules": {name: list(sig) for name, sig in self._modules.items()},
+            "entries": self._entries,
+        }
+        with open(path, "w") as fp:
+            json.dump(data, fp, separators=(",", ":"), sort_keys=True)
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        """
+        :raises ValueError: when file is not a valid snapshot for this Python
+        """
+        with open(path) as fp:
+            data = json.load(fp)
+
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            raise ValueError("unsupported snapshot version")
+
+        if data.get("python") != list(sys.version_info[:2]):
+            raise ValueError("snapshot was created by a different Python version")
+
+        snapshot = cls()
+        snapshot._modules = {
+            name: (sig[0], sig[1]) for name, sig in data["modules"].items()
+        }
+        snapshot._entries = data["entries"]
+        return snapshot
+
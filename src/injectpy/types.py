@@ -1,6 +1,6 @@
 import abc
 import enum
-from typing import Any, Callable, Type, TypeVar
+from typing import Any, Callable, Optional, Type, TypeVar, Union
 
 T = TypeVar("T")
 
@@ -13,6 +13,8 @@ class Lifetime(enum.Enum):
     singleton = enum.auto()
     transient = enum.auto()
     scoped = enum.auto()
+    #: instances are checked out of a pool for the duration of a scope
+    pooled = enum.auto()
 
 
 class Binder(abc.ABC):
@@ -26,9 +28,12 @@ class Binder(abc.ABC):
         service: Any,
         *,
         to: Any = None,
-        factory: Callable = None,
+        factory: Union[Callable, str] = None,
         instance: Any = None,
         lifetime: Lifetime = Lifetime.transient,
+        pool_size: int = None,
+        pool_timeout: float = None,
+        scope_level: Any = None,
     ) -> None:
         raise NotImplementedError
 
@@ -38,9 +43,12 @@ class Binder(abc.ABC):
         service: Any,
         *,
         to: Any = None,
-        factory: Callable = None,
+        factory: Union[Callable, str] = None,
         instance: Any = None,
         lifetime: Lifetime = Lifetime.transient,
+        pool_size: int = None,
+        pool_timeout: float = None,
+        scope_level: Any = None,
     ) -> None:
         """
         Removes all existing bindings for given service and adds new one.
@@ -48,9 +56,14 @@ class Binder(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def intercept(self, service: Type[T], *, handler: Callable[[T], None]) -> None:
+    def intercept(
+        self, service: Type[T], *, handler: Callable[[T], Optional[T]]
+    ) -> None:
         """
         Attaches a function which can modify instance before it's returned.
+
+        If the function returns something other than ``None`` it replaces
+        the instance (e.g. with a proxy).
         """
         raise NotImplementedError
 
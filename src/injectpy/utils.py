@@ -1,4 +1,6 @@
-from typing import Any, Tuple, Union
+import collections.abc
+import inspect
+from typing import Any, Callable, Optional, Tuple, Union
 
 
 def strip_optional(hint: Any) -> Tuple[Any, bool]:
@@ -18,3 +20,68 @@ def strip_optional(hint: Any) -> Tuple[Any, bool]:
 
     new_args = tuple(filter(lambda t: t is not none_type, args))
     return Union[new_args], True
+
+
+def strip_collection(hint: Any) -> Tuple[Any, Optional[Callable]]:
+    """
+    Strips List[], Sequence[] or Tuple[..., ...] from type hint.
+
+    :returns: tuple with item hint and type of the collection to create
+        (``None`` if hint is not a collection)
+    """
+    origin = getattr(hint, "__origin__", None)
+    args: Tuple[Any, ...] = getattr(hint, "__args__", None) or ()
+    if origin is list and len(args) == 1:
+        return args[0], list
+
+    if origin is collections.abc.Sequence and len(args) == 1:
+        return args[0], tuple
+
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return args[0], tuple
+
+    return hint, None
+
+
+def slots_repr(obj: Any) -> str:
+    """
+    Returns representation of ``__slots__`` class listing its attributes.
+    """
+    attributes = ", ".join(
+        f"{name}={getattr(obj, name)!r}" for name in type(obj).__slots__
+    )
+    return f"{type(obj).__name__}({attributes})"
+
+
+def dispose(instance: Any) -> None:
+    """
+    Releases resources held by an instance.
+
+    Uses ``close()`` if available, otherwise exits it as a context manager.
+    Instances without any of those are left alone.
+    """
+    close = getattr(instance, "close", None)
+    if callable(close):
+        close()
+    elif hasattr(instance, "__exit__"):
+        instance.__exit__(None, None, None)
+
+
+async def adispose(instance: Any) -> None:
+    """
+    Async version of ``dispose()``, preferring ``aclose()`` and ``__aexit__()``.
+    """
+    aclose = getattr(instance, "aclose", None)
+    if callable(aclose):
+        await aclose()
+    elif hasattr(instance, "__aexit__"):
+        await instance.__aexit__(None, None, None)
+    else:
+        close = getattr(instance, "close", None)
+        if callable(close):
+            # some libraries (like aiohttp) have "async def close()"
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        elif hasattr(instance, "__exit__"):
+            instance.__exit__(None, None, None)
@@ -0,0 +1,240 @@
+"""
+Checking kernel configuration without creating any instances.
+"""
+import enum
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import attr
+
+from .exceptions import CaptiveDependency, CircularDependency, Error, MissingBinding
+from .types import Lifetime
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .kernel import Kernel, Plan
+
+
+class ProblemKind(enum.Enum):
+    #: dependency is not bound and can't be created automatically
+    missing = enum.auto()
+    #: services depend on each other in a loop
+    cycle = enum.auto()
+    #: singleton or pooled service depends on scoped (or pooled) service
+    captive = enum.auto()
+
+
+EXCEPTIONS: Dict[ProblemKind, Type[Error]] = {
+    ProblemKind.missing: MissingBinding,
+    ProblemKind.cycle: CircularDependency,
+    ProblemKind.captive: CaptiveDependency,
+}
+
+
+def format_path(path: Iterable[Any]) -> str:
+    return " -> ".join(getattr(s, "__qualname__", repr(s)) for s in path)
+
+
+@attr.dataclass(frozen=True)
+class Problem:
+    kind: ProblemKind
+    #: chain of services leading to the problem
+    path: Tuple[Any, ...]
+
+    def __str__(self) -> str:
+        return format_path(self.path)
+
+    def to_exception(self) -> Error:
+        return EXCEPTIONS[self.kind](str(self))
+
+
+@attr.dataclass(frozen=True)
+class ValidationReport:
+    problems: List[Problem]
+    #: every reachable service, dependencies always go before their dependents
+    order: List[Any]
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+    def raise_for_problems(self) -> None:
+        """
+        Raises exception describing the first problem (if there is any).
+        """
+        if self.problems:
+            raise self.problems[0].to_exception()
+
+
+class Validator:
+    def __init__(self, kernel: "Kernel") -> None:
+        self._kernel = kernel
+        self._problems: List[Problem] = []
+        self._order: List[Any] = []
+        #: plans of every binding of a service (None if it can't be created)
+        self._plans: Dict[Any, Optional[Tuple["Plan", ...]]] = {}
+        self._visiting: List[Any] = []
+        self._visited: Set[Any] = set()
+        #: path to the first scoped service created together with a service
+        self._captured: Dict[Any, Optional[Tuple[Any, ...]]] = {}
+        #: services resolved on demand (with Provider or Lazy)
+        self._deferred: List[Any] = []
+
+    def validate(self) -> ValidationReport:
+        services = [
+            service for service, bindings in self._kernel._bindings.items() if bindings
+        ]
+        for service in services:
+            self._visit(service)
+
+        # deferred services are checked separately, they don't form cycles
+        # and aren't created together with the service depending on them
+        while self._deferred:
+            self._visit(self._deferred.pop(0))
+
+        # pooled instances outlive the scope they are created with too
+        for service in self._order:
+            for plan in self._plans[service] or ():
+                if plan.binding.lifetime not in (Lifetime.singleton, Lifetime.pooled):
+                    continue
+
+                captured = self._capture_plan(plan, {service})
+                if captured:
+                    self._problems.append(
+                        Problem(ProblemKind.captive, (service,) + captured)
+                    )
+                    break
+
+        return ValidationReport(problems=self._problems, order=self._order)
+
+    def _service_plans(self, service: Any) -> Optional[Tuple["Plan", ...]]:
+        """
+        Returns plans of every binding of a service, ``None`` if any of
+        them can't be created.
+        """
+        try:
+            plans = self._kernel._service_plans(service)
+        except Exception:
+            return None
+
+        for plan in plans:
+            if plan.target is not None and inspect.isabstract(
+                service
+                if plan.binding.factory is None and plan.to is None
+                else plan.target
+            ):
+                return None
+
+        return plans
+
+    def _visit(self, service: Any) -> None:
+        if service in self._visited:
+            return
+
+        if service in self._visiting:
+            start = self._visiting.index(service)
+            self._problems.append(
+                Problem(ProblemKind.cycle, tuple(self._visiting[start:]) + (service,))
+            )
+            return
+
+        plans = self._plans[service] = self._service_plans(service)
+        if plans is None:
+            self._problems.append(
+                Problem(ProblemKind.missing, tuple(self._visiting) + (service,))
+            )
+            self._visited.add(service)
+            return
+
+        self._visiting.append(service)
+        for plan in plans:
+            for dependency in self._dependencies(plan):
+                self._visit(dependency)
+
+            self._deferred.extend(
+                dep.service for dep in plan.dependencies if dep.deferred is not None
+            )
+
+        self._visiting.pop()
+        self._visited.add(service)
+        self._order.append(service)
+
+    def _dependencies(self, plan: "Plan") -> List[Any]:
+        bindings = self._kernel._bindings
+        # collection of a service without bindings is just empty
+        empty = {
+            dep.service
+            for dep in plan.dependencies
+            if dep.collection is not None
+            and dep.service is not None
+            and not bindings.get(dep.service)
+        }
+        return [service for service in dependencies(plan) if service not in empty]
+
+    def _capture(self, service: Any, seen: Set[Any]) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns path to the first scoped service which would be created
+        (and kept) together with given service.
+        """
+        if service in self._captured:
+            return self._captured[service]
+
+        result = None
+        seen.add(service)
+        for plan in self._plans.get(service) or ():
+            result = self._capture_plan(plan, seen)
+            if result:
+                break
+
+        self._captured[service] = result
+        return result
+
+    def _capture_plan(
+        self, plan: "Plan", seen: Set[Any]
+    ) -> Optional[Tuple[Any, ...]]:
+        for dependency in self._dependencies(plan):
+            if dependency in seen:
+                continue
+
+            for dep_plan in self._plans.get(dependency) or ():
+                result: Optional[Tuple[Any, ...]] = None
+                lifetime = dep_plan.binding.lifetime
+                if lifetime in (Lifetime.scoped, Lifetime.pooled):
+                    result = (dependency,)
+                elif lifetime is Lifetime.transient:
+                    captured = self._capture(dependency, seen)
+                    result = (dependency,) + captured if captured else None
+
+                if result:
+                    return result
+
+        return None
+
+
+def dependencies(plan: "Plan") -> List[Any]:
+    """
+    Returns services which have to be resolved to create an instance.
+
+    Collections (``List[T]`` etc.) are represented by the item service.
+    Deferred dependencies (``Provider[T]`` etc.) are not included.
+    """
+    if plan.binding.instance is not None:
+        return []
+
+    if plan.target is None:
+        return [plan.to]
+
+    return [
+        dep.service
+        for dep in plan.dependencies
+        if dep.service is not None and dep.deferred is None
+    ]
@@ -0,0 +1,411 @@
+"""
+Resolving services with async factories.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, List
+
+import pytest
+
+from injectpy import (
+    BindingIsAsync,
+    CircularDependency,
+    Kernel,
+    Lifetime,
+    Module,
+    factory,
+)
+from tests.types import IFileSystem, InMemoryFileSystem
+
+
+class Client:
+    def __init__(self, fs: IFileSystem) -> None:
+        self.fs = fs
+
+
+class Handler:
+    def __init__(self, client: Client) -> None:
+        self.client = client
+
+
+def test_async_factory() -> None:
+    """
+    Factories can be coroutine functions, but they must be resolved with aget().
+    """
+
+    async def create_client(fs: IFileSystem) -> Client:
+        await asyncio.sleep(0)
+        return Client(fs)
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Client, factory=create_client)
+
+    handler = asyncio.run(kernel.aget(Handler))
+    assert isinstance(handler.client, Client)
+    assert isinstance(handler.client.fs, InMemoryFileSystem)
+
+    with pytest.raises(BindingIsAsync):
+        kernel.get(Handler)
+
+
+def test_async_factory_in_module() -> None:
+    class MyModule(Module):
+        @factory(lifetime=Lifetime.singleton)
+        async def client(self, fs: IFileSystem) -> Client:
+            return Client(fs)
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.install(MyModule())
+
+    client = asyncio.run(kernel.aget(Client))
+    assert isinstance(client, Client)
+    # once created singleton can be retrieved synchronously
+    assert kernel.get(Handler).client is client
+
+
+def test_async_singleton_is_created_once() -> None:
+    """
+    Concurrent tasks share single construction of a singleton.
+    """
+    created: List[Client] = []
+
+    async def create_client(fs: IFileSystem) -> Client:
+        await asyncio.sleep(0.01)
+        client = Client(fs)
+        created.append(client)
+        return client
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Client, factory=create_client, lifetime=Lifetime.singleton)
+
+    async def main() -> List[Handler]:
+        return await asyncio.gather(*[kernel.aget(Handler) for _ in range(5)])
+
+    handlers = asyncio.run(main())
+
+    assert len(created) == 1
+    assert all(handler.client is created[0] for handler in handlers)
+
+
+def test_async_singleton_is_created_once_across_event_loops() -> None:
+    created: List[Client] = []
+    barrier = threading.Barrier(2, timeout=1)
+
+    async def create_client(fs: IFileSystem) -> Client:
+        await asyncio.sleep(0.05)
+        client = Client(fs)
+        created.append(client)
+        return client
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Client, factory=create_client, lifetime=Lifetime.singleton)
+    results: List[Any] = []
+
+    def worker() -> None:
+        barrier.wait()
+        # every thread runs its own event loop
+        results.append(asyncio.run(kernel.aget(Client)))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(created) == 1
+    assert results == created * 2
+
+
+def test_singleton_is_created_once_by_get_and_aget() -> None:
+    """
+    ``get()`` called while the singleton is being created by ``aget()``
+    (or the other way around) waits for that construction.
+    """
+    created: List[Client] = []
+    started = threading.Event()
+
+    def create_client(fs: IFileSystem) -> Client:
+        started.set()
+        time.sleep(0.05)
+        client = Client(fs)
+        created.append(client)
+        return client
+
+    def run_concurrently(first: Any, second: Any) -> List[Client]:
+        results: List[Client] = []
+        thread = threading.Thread(target=lambda: results.append(first()))
+        thread.start()
+        assert started.wait(timeout=1)
+        results.append(second())
+        thread.join()
+        return results
+
+    for first, second in [("get", "aget"), ("aget", "get")]:
+        created.clear()
+        started.clear()
+        kernel = Kernel()
+        kernel.bind(IFileSystem, to=InMemoryFileSystem)
+        kernel.bind(Client, factory=create_client, lifetime=Lifetime.singleton)
+
+        def call(method: str) -> Any:
+            if method == "get":
+                return lambda: kernel.get(Client)
+
+            return lambda: asyncio.run(kernel.aget(Client))
+
+        results = run_concurrently(call(first), call(second))
+
+        assert len(created) == 1
+        assert results == created * 2
+
+
+def test_async_scoped() -> None:
+    async def create_client(fs: IFileSystem) -> Client:
+        return Client(fs)
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Client, factory=create_client, lifetime=Lifetime.scoped)
+
+    async def main() -> None:
+        with kernel.nested_scope() as scope:
+            handler1 = await scope.aget(Handler)
+            handler2 = await scope.aget(Handler)
+            assert handler1 is not handler2
+            assert handler1.client is handler2.client
+
+    asyncio.run(main())
+
+
+class Chicken:
+    def __init__(self, egg: "Egg", fs: IFileSystem) -> None:
+        self.egg = egg
+
+
+class Egg:
+    def __init__(self, chicken: Chicken) -> None:
+        self.chicken = chicken
+
+
+def test_async_singleton_cycle() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Chicken, lifetime=Lifetime.singleton)
+    kernel.bind(Egg, lifetime=Lifetime.singleton)
+
+    with pytest.raises(CircularDependency):
+        kernel.get(Chicken)
+
+    with pytest.raises(CircularDependency):
+        asyncio.run(asyncio.wait_for(kernel.aget(Chicken), 5))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"lifetime": Lifetime.scoped}, {"lifetime": Lifetime.pooled, "pool_size": 2}],
+)
+def test_async_scoped_cycle(options: Any) -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Chicken, **options)
+    kernel.bind(Egg, **options)
+
+    async def main() -> None:
+        with kernel.nested_scope() as scope:
+            await asyncio.wait_for(scope.aget(Chicken), 5)
+
+    with pytest.raises(CircularDependency):
+        asyncio.run(main())
+
+
+class Nest:
+    """
+    Resolves both parts of the cycle concurrently, by separate tasks.
+    """
+
+    def __init__(self, chicken: Chicken, egg: Egg) -> None:
+        self.chicken = chicken
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"lifetime": Lifetime.singleton},
+        {"lifetime": Lifetime.scoped},
+        {"lifetime": Lifetime.pooled, "pool_size": 2},
+    ],
+)
+def test_async_cycle_resolved_concurrently(options: Any) -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Chicken, **options)
+    kernel.bind(Egg, **options)
+
+    async def main() -> None:
+        with kernel.nested_scope() as scope:
+            await asyncio.wait_for(scope.aget(Nest), 5)
+
+    with pytest.raises(CircularDependency):
+        asyncio.run(main())
+
+
+def test_async_transient_cycle() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+
+    with pytest.raises(CircularDependency):
+        asyncio.run(asyncio.wait_for(kernel.aget(Chicken), 5))
+
+    with pytest.raises(CircularDependency):
+        asyncio.run(asyncio.wait_for(kernel.aget(Nest), 5))
+
+
+class ConcurrencyTracker:
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+
+    async def run(self) -> None:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+
+class ClientA:
+    pass
+
+
+class ClientB:
+    pass
+
+
+class ClientC:
+    pass
+
+
+class Service:
+    def __init__(self, a: ClientA, b: ClientB, c: ClientC) -> None:
+        self.a = a
+        self.b = b
+        self.c = c
+
+
+def create_kernel(tracker: ConcurrencyTracker) -> Kernel:
+    def async_factory(cls: type) -> Any:
+        async def create() -> Any:
+            await tracker.run()
+            return cls()
+
+        return create
+
+    kernel = Kernel()
+    for cls in (ClientA, ClientB, ClientC):
+        kernel.bind(cls, factory=async_factory(cls), lifetime=Lifetime.singleton)
+
+    return kernel
+
+
+def test_independent_dependencies_are_created_concurrently() -> None:
+    tracker = ConcurrencyTracker()
+    kernel = create_kernel(tracker)
+
+    service = asyncio.run(kernel.aget(Service))
+
+    assert tracker.max_running == 3
+    assert service.a is kernel.get(ClientA)
+    assert isinstance(service.b, ClientB)
+    assert isinstance(service.c, ClientC)
+
+
+def test_concurrency_can_be_limited() -> None:
+    tracker = ConcurrencyTracker()
+    kernel = create_kernel(tracker)
+
+    service = asyncio.run(kernel.aget(Service, max_concurrency=2))
+
+    assert tracker.max_running == 2
+    assert isinstance(service, Service)
+
+
+def test_scoped_dependency_shared_between_siblings() -> None:
+    """
+    Siblings created concurrently must still share scoped instance.
+    """
+    created: List[Client] = []
+
+    async def create_client(fs: IFileSystem) -> Client:
+        await asyncio.sleep(0.01)
+        created.append(Client(fs))
+        return created[-1]
+
+    class TwoHandlers:
+        def __init__(self, first: Handler, second: Handler) -> None:
+            self.first = first
+            self.second = second
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Client, factory=create_client, lifetime=Lifetime.scoped)
+
+    async def main() -> TwoHandlers:
+        with kernel.nested_scope() as scope:
+            return await scope.aget(TwoHandlers)
+
+    inst = asyncio.run(main())
+    assert len(created) == 1
+    assert inst.first.client is inst.second.client
+
+
+def test_failed_dependency_cancels_the_other_ones() -> None:
+    """
+    When one dependency fails, others are cancelled, so they don't create
+    scoped instances after the scope has ended.
+    """
+    created: List[Any] = []
+
+    class Slow:
+        def __init__(self) -> None:
+            self.closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    class Failing:
+        pass
+
+    class Service:
+        def __init__(self, slow: Slow, failing: Failing) -> None:
+            pass
+
+    async def create_slow() -> Slow:
+        await asyncio.sleep(0.05)
+        slow = Slow()
+        created.append(slow)
+        return slow
+
+    async def create_failing() -> Failing:
+        await asyncio.sleep(0)
+        raise ValueError("can't create")
+
+    kernel = Kernel()
+    kernel.bind(Slow, factory=create_slow, lifetime=Lifetime.scoped)
+    kernel.bind(Failing, factory=create_failing, lifetime=Lifetime.scoped)
+
+    async def main() -> None:
+        scope = kernel.nested_scope()
+        with pytest.raises(ValueError):
+            async with scope:
+                await scope.aget(Service)
+
+        await asyncio.sleep(0.1)
+        assert not scope._instances
+        assert all(slow.closed for slow in created)
+
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+from typing import Any, List
+
+from injectpy import Kernel, Lifetime, Provider
+from injectpy.reflection import Inspection
+from tests.types import (
+    IFileSystem,
+    ISimpleEventBus,
+    IWebRouter,
+    LocalFileSystem,
+    NoopEventBus,
+    S3FileSystem,
+    WebRouter,
+)
+
+
+class Uploader:
+    def __init__(self, fs: IFileSystem) -> None:
+        self.fs = fs
+
+
+class Notifier:
+    def __init__(self, bus: ISimpleEventBus) -> None:
+        self.bus = bus
+
+
+class Leaf:
+    pass
+
+
+class OtherLeaf(Leaf):
+    pass
+
+
+class UsesLeaf:
+    def __init__(self, leaf: Leaf) -> None:
+        self.leaf = leaf
+
+
+class Cyclic:
+    def __init__(self, head: "Head") -> None:
+        self.head = head
+
+
+class Middle:
+    def __init__(self, cyclic: Cyclic, uses_leaf: UsesLeaf) -> None:
+        self.cyclic = cyclic
+        self.uses_leaf = uses_leaf
+
+
+class Head:
+    def __init__(self, middle: Provider[Middle]) -> None:
+        self.middle = middle
+
+
+def create_kernel() -> Kernel:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=S3FileSystem)
+    kernel.bind(ISimpleEventBus, to=NoopEventBus, lifetime=Lifetime.singleton)
+    kernel.bind(Uploader, lifetime=Lifetime.singleton)
+    kernel.bind(Notifier, lifetime=Lifetime.singleton)
+    return kernel
+
+
+def test_child_uses_configuration_of_parent() -> None:
+    kernel = create_kernel()
+    kernel.get(Uploader)
+
+    child = kernel.child()
+
+    assert isinstance(child.get(Uploader).fs, S3FileSystem)
+    # plans are shared until configuration changes
+    assert child._plans is kernel._plans
+
+
+def test_child_changes_are_not_visible_in_parent() -> None:
+    kernel = create_kernel()
+    child = kernel.child()
+
+    child.rebind(IFileSystem, to=LocalFileSystem)
+    child.bind(IWebRouter, to=WebRouter)
+
+    assert isinstance(child.get(Uploader).fs, LocalFileSystem)
+    assert isinstance(kernel.get(Uploader).fs, S3FileSystem)
+    assert list(kernel._bindings) == [IFileSystem, ISimpleEventBus, Uploader, Notifier]
+
+
+def test_overriding_service_keeps_unaffected_plans(monkeypatch: Any) -> None:
+    """
+    Only plans built from the changed binding are dropped, the rest of
+    the graph isn't inspected again.
+    """
+    kernel = create_kernel()
+    kernel.get(Uploader)
+    kernel.get(Notifier)
+    child = kernel.child()
+
+    inspected: List[Any] = []
+    original = Inspection.inspect
+
+    def counting_inspect(obj: Any) -> Inspection:
+        inspected.append(obj)
+        return original(obj)
+
+    monkeypatch.setattr(Inspection, "inspect", counting_inspect)
+    child.rebind(IFileSystem, to=LocalFileSystem)
+
+    assert isinstance(child.get(Uploader).fs, LocalFileSystem)
+    assert isinstance(child.get(Notifier).bus, NoopEventBus)
+    assert inspected == [LocalFileSystem]
+    assert child._plans[Notifier] is kernel._plans[Notifier]
+
+
+def test_parent_changes_are_not_visible_in_child() -> None:
+    kernel = create_kernel()
+    child = kernel.child()
+
+    kernel.rebind(IFileSystem, to=LocalFileSystem)
+
+    assert isinstance(child.get(Uploader).fs, S3FileSystem)
+    assert isinstance(kernel.get(Uploader).fs, LocalFileSystem)
+
+
+def test_singletons_are_not_shared_by_default() -> None:
+    kernel = create_kernel()
+    child = kernel.child()
+
+    assert child.get(Notifier) is not kernel.get(Notifier)
+
+
+def test_shared_singletons() -> None:
+    kernel = create_kernel()
+    notifier = kernel.get(Notifier)
+    child = kernel.child(share_singletons=True)
+
+    assert child.get(Notifier) is notifier
+    # singletons created by the child are shared as well
+    assert child.get(Uploader) is kernel.get(Uploader)
+
+
+def test_shared_singletons_depending_on_overridden_service_are_dropped() -> None:
+    kernel = create_kernel()
+    uploader = kernel.get(Uploader)
+    notifier = kernel.get(Notifier)
+    child = kernel.child(share_singletons=True)
+
+    child.rebind(IFileSystem, to=LocalFileSystem)
+
+    assert child.get(Notifier) is notifier
+    assert isinstance(child.get(Uploader).fs, LocalFileSystem)
+    # parent keeps its singletons
+    assert kernel.get(Uploader) is uploader
+    assert kernel.get(Uploader) is not child.get(Uploader)
+
+
+def test_shared_singletons_in_dependency_cycle_are_dropped() -> None:
+    """
+    Services depending on each other through ``Provider`` are checked
+    correctly no matter which one is requested first.
+    """
+    kernel = Kernel()
+    for service in (Leaf, UsesLeaf, Cyclic, Middle, Head):
+        kernel.bind(service, lifetime=Lifetime.singleton)
+    kernel.get(Head).middle()
+    child = kernel.child(share_singletons=True)
+
+    child.rebind(Leaf, to=OtherLeaf, lifetime=Lifetime.singleton)
+
+    head = child.get(Head)
+    assert head is not kernel.get(Head)
+    assert child.get(Cyclic).head is head
+    assert isinstance(head.middle().uses_leaf.leaf, OtherLeaf)
+
+
+def test_shared_singletons_after_override_in_parent() -> None:
+    kernel = create_kernel()
+    notifier = kernel.get(Notifier)
+    child = kernel.child(share_singletons=True)
+
+    kernel.rebind(IFileSystem, to=LocalFileSystem)
+    kernel.rebind(ISimpleEventBus, to=NoopEventBus, lifetime=Lifetime.singleton)
+
+    assert isinstance(kernel.get(Uploader).fs, LocalFileSystem)
+    assert kernel.get(Notifier) is not notifier
+    # child keeps configuration it was created with
+    assert isinstance(child.get(Uploader).fs, S3FileSystem)
+    assert child.get(Notifier) is notifier
+
+
+def test_interceptors_of_child() -> None:
+    class MyRoute:
+        pass
+
+    kernel = Kernel()
+    kernel.bind(IWebRouter, to=WebRouter, lifetime=Lifetime.singleton)
+    router = kernel.get(IWebRouter)  # type: ignore
+    child = kernel.child(share_singletons=True)
+
+    child.intercept(WebRouter, handler=lambda r: r.add_route(MyRoute))
+
+    assert child.get(IWebRouter).routes == [MyRoute]  # type: ignore
+    assert router.routes == []  # type: ignore
+
+
+def test_child_of_frozen_kernel_can_be_changed() -> None:
+    kernel = create_kernel().freeze()
+    child = kernel.child()
+
+    child.rebind(IFileSystem, to=LocalFileSystem)
+
+    assert isinstance(child.get(Uploader).fs, LocalFileSystem)
+    assert isinstance(kernel.get(Uploader).fs, S3FileSystem)
@@ -0,0 +1,92 @@
+"""
+Compiled resolution functions must behave exactly like ``Kernel.get``.
+"""
+import pytest
+
+from injectpy import BindingIsScoped, Kernel, Lifetime
+from tests.types import (
+    IFileSystem,
+    InMemoryFileSystem,
+    ISimpleEventBus,
+    IWebRouter,
+    LocalFileSystem,
+    S3FileSystem,
+    WebRouter,
+)
+
+
+class Handler:
+    def __init__(
+        self, fs: IFileSystem, router: IWebRouter, bus: ISimpleEventBus = None
+    ) -> None:
+        self.fs = fs
+        self.router = router
+        self.bus = bus
+
+
+def test_compiled_function_creates_whole_graph() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(IWebRouter, to=WebRouter)
+
+    create = kernel.compile(Handler)
+    inst = create()
+
+    assert isinstance(inst, Handler)
+    assert isinstance(inst.fs, InMemoryFileSystem)
+    assert isinstance(inst.router, WebRouter)
+    assert inst.bus is None
+    assert create() is not inst
+
+
+def test_compiled_function_shares_singletons_with_kernel() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.singleton)
+    kernel.bind(IWebRouter, to=WebRouter)
+
+    create = kernel.compile(Handler)
+    inst1 = create()
+    inst2 = create()
+
+    assert inst1.fs is inst2.fs is kernel.get(IFileSystem)  # type: ignore
+    assert inst1.router is not inst2.router
+
+
+def test_compiled_function_uses_scope() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.scoped)
+    kernel.bind(IWebRouter, to=WebRouter)
+    create = kernel.compile(Handler)
+
+    with kernel.nested_scope() as scope:
+        inst1 = create(scope)
+        inst2 = create(scope)
+        assert inst1.fs is inst2.fs is scope.get(IFileSystem)  # type: ignore
+
+    with pytest.raises(BindingIsScoped):
+        create()
+
+
+def test_compiled_function_runs_interceptors() -> None:
+    class MyRoute:
+        pass
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(IWebRouter, to=WebRouter)
+    kernel.intercept(WebRouter, handler=lambda router: router.add_route(MyRoute))
+
+    inst = kernel.compile(Handler)()
+    assert inst.router.routes == [MyRoute]  # type: ignore
+
+
+def test_compiled_function_follows_rebinding() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=S3FileSystem)
+    kernel.bind(IWebRouter, to=WebRouter)
+    create = kernel.compile(Handler)
+
+    kernel.rebind(IFileSystem, to=LocalFileSystem)
+
+    assert isinstance(create().fs, LocalFileSystem)
+    assert isinstance(kernel.compile(Handler)().fs, LocalFileSystem)
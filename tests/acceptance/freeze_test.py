@@ -0,0 +1,88 @@
+"""
+Frozen kernel is a read-only, pre-validated container.
+"""
+import pytest
+
+from injectpy import Kernel, KernelIsFrozen, Lifetime, MissingBinding, Module, factory
+from tests.types import (
+    IFileSystem,
+    InMemoryFileSystem,
+    ISimpleEventBus,
+    IWebRouter,
+    NoopEventBus,
+    WebRouter,
+)
+
+
+class Handler:
+    def __init__(self, fs: IFileSystem, bus: ISimpleEventBus = None) -> None:
+        self.fs = fs
+        self.bus = bus
+
+
+def test_frozen_kernel_resolves_services() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.singleton)
+    kernel.bind(Handler)
+
+    frozen = kernel.freeze()
+    inst1 = frozen.get(Handler)
+    inst2 = frozen.get(Handler)
+
+    assert frozen is kernel
+    assert inst1 is not inst2
+    assert inst1.fs is inst2.fs
+    assert inst1.bus is None
+
+
+def test_frozen_kernel_supports_scopes() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.scoped)
+    kernel.bind(Handler)
+    kernel.freeze()
+
+    with kernel.nested_scope() as scope:
+        assert scope.get(Handler).fs is scope.get(Handler).fs
+
+
+def test_frozen_kernel_resolves_unbound_classes() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.freeze()
+
+    assert isinstance(kernel.get(Handler), Handler)
+
+
+def test_configuration_is_rejected_after_freezing() -> None:
+    class MyModule(Module):
+        @factory()
+        def bus(self) -> ISimpleEventBus:
+            return NoopEventBus()
+
+    kernel = Kernel()
+    kernel.freeze()
+
+    with pytest.raises(KernelIsFrozen):
+        kernel.bind(IWebRouter, to=WebRouter)
+
+    with pytest.raises(KernelIsFrozen):
+        kernel.rebind(IWebRouter, to=WebRouter)
+
+    with pytest.raises(KernelIsFrozen):
+        kernel.intercept(WebRouter, handler=lambda router: None)
+
+    with pytest.raises(KernelIsFrozen):
+        kernel.install(MyModule())
+
+
+def test_freeze_detects_missing_bindings() -> None:
+    kernel = Kernel()
+    kernel.bind(Handler)
+
+    with pytest.raises(MissingBinding) as info:
+        kernel.freeze()
+
+    assert str(info.value) == "Handler -> IFileSystem"
+    # kernel stays usable after failed freeze
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.freeze()
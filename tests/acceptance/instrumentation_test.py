@@ -0,0 +1,121 @@
+"""
+Observing resolutions.
+"""
+import asyncio
+from typing import List
+
+import pytest
+
+from injectpy import Kernel, Lifetime
+from injectpy.instrumentation import Observer, ResolveEvent, StatsCollector
+from tests.types import IFileSystem, InMemoryFileSystem
+
+
+class Handler:
+    def __init__(self, fs: IFileSystem) -> None:
+        self.fs = fs
+
+
+class RecordingObserver(Observer):
+    def __init__(self) -> None:
+        self.events: List[str] = []
+        self.finished: List[ResolveEvent] = []
+
+    def resolve_started(self, event: ResolveEvent) -> None:
+        self.events.append(f"start {event.service.__name__}")
+
+    def resolve_finished(self, event: ResolveEvent) -> None:
+        self.events.append(f"end {event.service.__name__}")
+        self.finished.append(event)
+
+
+def test_observer_receives_events() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.singleton)
+    observer = RecordingObserver()
+    kernel.add_observer(observer)
+
+    kernel.get(Handler)
+    kernel.get(Handler)
+
+    assert observer.events == [
+        "start Handler",
+        "start IFileSystem",
+        "start InMemoryFileSystem",
+        "end InMemoryFileSystem",
+        "end IFileSystem",
+        "end Handler",
+        "start Handler",
+        "start IFileSystem",
+        "end IFileSystem",
+        "end Handler",
+    ]
+    fs_events = [e for e in observer.finished if e.service is IFileSystem]
+    assert [e.cached for e in fs_events] == [False, True]
+    assert all(e.lifetime is Lifetime.singleton for e in fs_events)
+    assert all(e.duration is not None and e.duration >= 0 for e in fs_events)
+
+
+def test_observer_sees_compiled_and_async_resolutions() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Handler)
+    kernel.freeze()
+    observer = RecordingObserver()
+    kernel.add_observer(observer)
+
+    kernel.get(Handler)
+    asyncio.run(kernel.aget(Handler))
+
+    assert observer.events.count("end Handler") == 2
+    assert observer.events.count("end InMemoryFileSystem") == 2
+
+
+def test_observer_is_notified_about_errors() -> None:
+    class Broken:
+        def __init__(self) -> None:
+            raise ValueError("broken")
+
+    kernel = Kernel()
+    observer = RecordingObserver()
+    kernel.add_observer(observer)
+
+    with pytest.raises(ValueError):
+        kernel.get(Broken)
+
+    assert isinstance(observer.finished[0].error, ValueError)
+
+
+def test_removing_observer() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    observer = RecordingObserver()
+    kernel.add_observer(observer)
+    kernel.remove_observer(observer)
+
+    kernel.get(Handler)
+    assert observer.events == []
+
+
+def test_stats_collector() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.singleton)
+    collector = StatsCollector()
+    kernel.add_observer(collector)
+
+    for _ in range(3):
+        kernel.get(Handler)
+
+    stats = {s.service: s for s in collector.stats()}
+    assert stats[Handler].count == 3
+    assert stats[Handler].hits == 0
+    assert stats[IFileSystem].hits == 2
+    assert stats[IFileSystem].misses == 1
+    assert stats[Handler].total >= stats[Handler].p99 >= stats[Handler].p50
+
+    dumped = collector.dump()
+    assert dumped[0]["service"] == "Handler"
+    assert {"count", "hits", "misses", "total", "p50", "p95", "p99"} <= set(dumped[0])
+
+    collector.reset()
+    assert collector.stats() == []
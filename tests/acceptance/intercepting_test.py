@@ -1,7 +1,23 @@
+from typing import List
+
 import pytest
 
-from injectpy import Kernel, Module, intercept
-from tests.types import IWebRouter, WebRouter
+from injectpy import Kernel, Lifetime, Module, intercept
+from tests.types import IFileSystem, InMemoryFileSystem, IWebRouter, WebRouter
+
+
+class CountingFileSystem(IFileSystem):
+    """
+    Decorator counting calls of the wrapped file system.
+    """
+
+    def __init__(self, inner: IFileSystem) -> None:
+        self.inner = inner
+        self.calls = 0
+
+    def exists(self, path: str) -> bool:
+        self.calls += 1
+        return self.inner.exists(path)
 
 
 def test_interceptors_allow_you_to_modify_instances() -> None:
@@ -99,3 +115,202 @@ def test_error_when_cant_locale_first_parameter() -> None:
                 pass
 
     assert str(info.value) == "'my_interceptor' has no first positional argument"
+
+
+def test_interceptors_of_base_classes_apply_to_subclasses() -> None:
+    """
+    Interceptor registered on a base class (or ABC) applies to every service
+    inheriting from it, after interceptors of more specific classes.
+    """
+
+    class MyRoute1:
+        pass
+
+    class MyRoute2:
+        pass
+
+    class AdminRouter(WebRouter):
+        pass
+
+    kernel = Kernel()
+    kernel.intercept(
+        IWebRouter, handler=lambda r: r.add_route(MyRoute1)  # type: ignore
+    )
+    kernel.intercept(AdminRouter, handler=lambda r: r.add_route(MyRoute2))
+
+    assert kernel.get(WebRouter).routes == [MyRoute1]
+    assert kernel.get(AdminRouter).routes == [MyRoute2, MyRoute1]
+
+
+def test_base_class_interceptor_runs_once_for_bound_interface() -> None:
+    """
+    When an interface is bound to its implementation the instance is
+    intercepted only once, even though both match the interceptor.
+    """
+
+    class MyRoute:
+        pass
+
+    kernel = Kernel()
+    kernel.bind(IWebRouter, to=WebRouter)
+    kernel.intercept(IWebRouter, handler=lambda r: r.add_route(MyRoute))  # type: ignore
+
+    inst = kernel.get(IWebRouter)  # type: ignore
+
+    assert inst.routes == [MyRoute]  # type: ignore
+
+
+def test_interceptors_are_resolved_once_per_plan() -> None:
+    """
+    Matching interceptors are found when the plan is built, services
+    without interceptors don't have any.
+    """
+    kernel = Kernel()
+    kernel.intercept(IWebRouter, handler=lambda r: None)  # type: ignore
+
+    assert kernel._plan(WebRouter).interceptor is not None
+    assert kernel._plan(IFileSystem).interceptor is None
+
+
+def test_interceptor_can_replace_instance() -> None:
+    """
+    Value returned by an interceptor replaces the instance, so services can
+    be wrapped with decorators / proxies without touching their factories.
+    """
+
+    class MyModule(Module):
+        @intercept()
+        def count_calls(self, fs: IFileSystem) -> IFileSystem:
+            return CountingFileSystem(fs)
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.singleton)
+    kernel.install(MyModule())
+
+    inst = kernel.get(IFileSystem)  # type: ignore
+
+    assert isinstance(inst, CountingFileSystem)
+    assert isinstance(inst.inner, InMemoryFileSystem)
+    # singleton caches the replacement
+    assert kernel.get(IFileSystem) is inst  # type: ignore
+
+
+def test_replacing_interceptors_are_composed() -> None:
+    """
+    Each interceptor gets the instance returned by the previous one,
+    interceptors returning ``None`` keep it.
+    """
+    seen: List[IFileSystem] = []
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.intercept(IFileSystem, handler=CountingFileSystem)  # type: ignore
+    kernel.intercept(IFileSystem, handler=seen.append)  # type: ignore
+    kernel.intercept(IFileSystem, handler=CountingFileSystem)  # type: ignore
+
+    inst = kernel.get(IFileSystem)  # type: ignore
+
+    assert isinstance(inst, CountingFileSystem)
+    assert isinstance(inst.inner, CountingFileSystem)
+    assert isinstance(inst.inner.inner, InMemoryFileSystem)
+    assert seen == [inst.inner]
+
+    compiled = kernel.compile(IFileSystem)()  # type: ignore
+    assert isinstance(compiled.inner.inner, InMemoryFileSystem)  # type: ignore
+
+
+def test_interceptor_of_base_class_does_not_replace_subclass() -> None:
+    """
+    Interceptor returning instance of another class (according to its return
+    type) is only used for the service it's registered for, otherwise
+    ``get(InMemoryFileSystem)`` would return a ``CountingFileSystem``.
+    """
+    wrapped: List[IFileSystem] = []
+
+    class Reader:
+        def __init__(self, fs: InMemoryFileSystem) -> None:
+            self.fs = fs
+
+    def count_calls(fs: IFileSystem) -> CountingFileSystem:
+        wrapped.append(fs)
+        return CountingFileSystem(fs)
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.intercept(IFileSystem, handler=count_calls)
+
+    assert isinstance(kernel.get(IFileSystem), CountingFileSystem)  # type: ignore
+    assert type(kernel.get(InMemoryFileSystem)) is InMemoryFileSystem
+    assert type(kernel.get(Reader).fs) is InMemoryFileSystem
+    # it isn't even called for the subclass
+    assert len(wrapped) == 1
+
+
+def test_interceptor_can_replace_bound_implementation() -> None:
+    """
+    Proxy registered for an interface wraps its implementation even when
+    the implementation is bound on its own, e.g. as a singleton.
+    """
+    seen: List[type] = []
+    wrapped: List[IFileSystem] = []
+
+    def count_calls(fs: IFileSystem) -> CountingFileSystem:
+        wrapped.append(fs)
+        return CountingFileSystem(fs)
+
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(InMemoryFileSystem, lifetime=Lifetime.singleton)
+    kernel.intercept(IFileSystem, handler=count_calls)
+    kernel.intercept(
+        IFileSystem, handler=lambda fs: seen.append(type(fs))  # type: ignore
+    )
+
+    fs = kernel.get(IFileSystem)  # type: ignore
+    impl = kernel.get(InMemoryFileSystem)
+
+    assert isinstance(fs, CountingFileSystem)
+    assert fs.inner is impl
+    assert wrapped == [impl]
+    assert kernel.get(IFileSystem).inner is impl  # type: ignore
+    assert kernel.compile(IFileSystem)().inner is impl  # type: ignore
+    # proxy is created once per resolution of the interface
+    assert wrapped == [impl] * 3
+    # interceptors modifying the instance run only once, for the singleton
+    assert seen == [InMemoryFileSystem]
+
+
+def test_replacement_of_unknown_type_must_be_instance_of_service() -> None:
+    """
+    When interceptor of a base class has no return type it's used for
+    subclasses too, so its replacement must be an instance of the subclass.
+    """
+    kernel = Kernel()
+    kernel.intercept(
+        IFileSystem, handler=lambda fs: CountingFileSystem(fs)  # type: ignore
+    )
+
+    with pytest.raises(TypeError, match="annotate its return type"):
+        kernel.get(InMemoryFileSystem)
+
+
+def test_replacing_interceptors_follow_configuration_changes() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    assert isinstance(kernel.get(IFileSystem), InMemoryFileSystem)  # type: ignore
+
+    kernel.intercept(IFileSystem, handler=CountingFileSystem)  # type: ignore
+    assert isinstance(kernel.get(IFileSystem), CountingFileSystem)  # type: ignore
+
+    created: List[InMemoryFileSystem] = []
+    kernel.intercept(InMemoryFileSystem, handler=created.append)
+    fs = kernel.get(IFileSystem)  # type: ignore
+    assert created == [fs.inner]  # type: ignore
+
+    # bound class is shared with other services, it's wrapped by their plans
+    kernel.bind(InMemoryFileSystem)
+    fs = kernel.get(IFileSystem)  # type: ignore
+    assert isinstance(fs, CountingFileSystem)
+    assert type(fs.inner) is InMemoryFileSystem
+    assert created[-1] is fs.inner
+    assert type(kernel.get(InMemoryFileSystem)) is InMemoryFileSystem
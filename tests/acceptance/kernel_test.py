@@ -1,4 +1,10 @@
-from injectpy import Kernel
+import gc
+import typing
+import weakref
+from typing import Any, List, Optional
+
+from injectpy import Kernel, Lifetime, Provider
+from injectpy.reflection import Inspection
 from tests.types import (
     IFileSystem,
     ISimpleEventBus,
@@ -10,7 +16,6 @@ from tests.types import (
 )
 
 # TODO: nice error when can't instantiate abstract class / protocol
-# TODO: detect circular dependencies
 # TODO: ensure that protocols work :)
 # TODO: "when" for contextual binding
 
@@ -151,6 +156,16 @@ class TestKernel:
         inst = kernel.get(IFileSystem)  # type: ignore
         assert isinstance(inst, LocalFileSystem)
 
+    def test_rebind_drops_created_singleton(self) -> None:
+        kernel = Kernel()
+        kernel.bind(IFileSystem, to=S3FileSystem, lifetime=Lifetime.singleton)
+        kernel.get(IFileSystem)  # type: ignore
+
+        kernel.rebind(IFileSystem, to=LocalFileSystem, lifetime=Lifetime.singleton)
+
+        inst = kernel.get(IFileSystem)  # type: ignore
+        assert isinstance(inst, LocalFileSystem)
+
     def test_rebind_doesnt_crash_if_binding_does_not_exist(self) -> None:
         """
         rebind() should not crash if binding doesn't already exist.
@@ -161,3 +176,125 @@ class TestKernel:
 
         inst = kernel.get(IFileSystem)  # type: ignore
         assert isinstance(inst, S3FileSystem)
+
+    def test_reflection_is_done_once_per_service(self, monkeypatch: Any) -> None:
+        """
+        Resolution plans are cached, so a service is inspected only once
+        no matter how many times it's resolved.
+        """
+        calls: List[Any] = []
+        original = Inspection.inspect
+
+        def counting_inspect(obj: Any) -> Inspection:
+            calls.append(obj)
+            return original(obj)
+
+        monkeypatch.setattr(Inspection, "inspect", counting_inspect)
+
+        class MyHandler:
+            def __init__(self, fs: IFileSystem) -> None:
+                self.fs = fs
+
+        kernel = Kernel()
+        kernel.bind(IFileSystem, to=LocalFileSystem)
+        for _ in range(3):
+            kernel.get(MyHandler)
+
+        assert calls == [MyHandler, LocalFileSystem]
+
+    def test_binding_after_resolution_is_respected(self) -> None:
+        """
+        Cached plans are invalidated when bindings change.
+        """
+
+        class MyHandler:
+            def __init__(self, bus: ISimpleEventBus = None) -> None:
+                self.bus = bus
+
+        kernel = Kernel()
+        assert kernel.get(MyHandler).bus is None
+
+        kernel.bind(ISimpleEventBus, to=NoopEventBus)
+        assert isinstance(kernel.get(MyHandler).bus, NoopEventBus)
+
+        kernel.rebind(MyHandler, instance=MyHandler())
+        assert kernel.get(MyHandler).bus is None
+
+    def test_resolving_does_not_keep_auto_wired_classes_alive(self) -> None:
+        """
+        Kernel must not grow when resolving classes which are not bound,
+        dynamically created classes must be garbage collected.
+        """
+        kernel = Kernel()
+        kernel.bind(IFileSystem, to=LocalFileSystem)
+
+        def create_class() -> "weakref.ref[type]":
+            class Dynamic:
+                def __init__(self, fs: IFileSystem) -> None:
+                    self.fs = fs
+
+            assert isinstance(kernel.get(Dynamic).fs, LocalFileSystem)
+            return weakref.ref(Dynamic)
+
+        refs = [create_class() for _ in range(10)]
+        gc.collect()
+
+        assert all(ref() is None for ref in refs)
+        assert list(kernel._bindings) == [IFileSystem]
+
+    def test_base_class_interceptors_do_not_keep_auto_wired_classes_alive(
+        self,
+    ) -> None:
+        kernel = Kernel()
+        kernel.intercept(IFileSystem, handler=lambda fs: None)  # type: ignore
+
+        def create_class() -> "weakref.ref[type]":
+            dynamic = type("Dynamic", (LocalFileSystem,), {})
+            assert isinstance(kernel.get(dynamic), dynamic)
+            return weakref.ref(dynamic)
+
+        refs = [create_class() for _ in range(10)]
+        gc.collect()
+
+        assert all(ref() is None for ref in refs)
+
+    def test_injecting_unbound_services_does_not_keep_them_alive(self) -> None:
+        kernel = Kernel()
+
+        def create_classes() -> "weakref.ref[type]":
+            class Other:
+                pass
+
+            class Dynamic:
+                def __init__(
+                    self,
+                    provider: Provider[Other],
+                    others: List[Other],
+                    other: Optional[Other] = None,
+                ) -> None:
+                    self.others = others
+
+            assert kernel.get(Dynamic).others == []
+            assert kernel.get_all(Other) == []
+            return weakref.ref(Other)
+
+        refs = [create_classes() for _ in range(5)]
+        # typing caches subscripted generics on its own
+        for clear_cache in getattr(typing, "_cleanups", ()):
+            clear_cache()
+        # plans of collected classes are dropped by weakref callbacks
+        gc.collect()
+        gc.collect()
+
+        assert all(ref() is None for ref in refs)
+        assert not kernel._multi_plans
+
+    def test_auto_wired_plans_are_bounded(self) -> None:
+        kernel = Kernel()
+        kernel.implicit_plans_limit = 5
+        classes = [type(f"Class{i}", (), {}) for i in range(20)]
+
+        for cls in classes:
+            assert isinstance(kernel.get(cls), cls)
+
+        assert len(kernel._implicit_plans) <= 5
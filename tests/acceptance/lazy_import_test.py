@@ -0,0 +1,93 @@
+"""
+Binding to classes and factories which are imported on first use.
+"""
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from injectpy import Kernel, Lifetime
+from tests.types import IFileSystem, InMemoryFileSystem
+
+MODULE = '''
+from tests.types import IFileSystem
+
+
+class HeavyFileSystem(IFileSystem):
+    def exists(self, path: str) -> bool:
+        return True
+
+
+def create_filesystem() -> IFileSystem:
+    return HeavyFileSystem()
+'''
+
+
+@pytest.fixture
+def heavy_module(tmp_path: Path, monkeypatch: Any) -> Iterator[str]:
+    (tmp_path / "heavy_fs.py").write_text(MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "heavy_fs"
+    sys.modules.pop("heavy_fs", None)
+
+
+def test_to_reference_is_imported_on_first_resolution(heavy_module: str) -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to="heavy_fs:HeavyFileSystem")
+
+    assert heavy_module not in sys.modules
+
+    instance = kernel.get(IFileSystem)  # type: ignore
+
+    assert type(instance).__name__ == "HeavyFileSystem"
+    assert type(instance) is sys.modules[heavy_module].HeavyFileSystem
+
+
+def test_factory_reference(heavy_module: str) -> None:
+    kernel = Kernel()
+    kernel.bind(
+        IFileSystem, factory="heavy_fs:create_filesystem", lifetime=Lifetime.singleton
+    )
+
+    instance = kernel.get(IFileSystem)  # type: ignore
+
+    assert type(instance).__name__ == "HeavyFileSystem"
+    assert kernel.get(IFileSystem) is instance  # type: ignore
+    assert kernel.validate().ok
+
+
+def test_import_report(heavy_module: str) -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to="heavy_fs:HeavyFileSystem")
+    kernel.bind(InMemoryFileSystem, factory="heavy_fs:create_filesystem")
+
+    report = kernel.import_report()
+    assert report.imported == {}
+    assert report.not_imported == [
+        "heavy_fs:HeavyFileSystem",
+        "heavy_fs:create_filesystem",
+    ]
+
+    kernel.get(IFileSystem)  # type: ignore
+
+    report = kernel.import_report()
+    assert list(report.imported) == ["heavy_fs:HeavyFileSystem"]
+    assert report.imported["heavy_fs:HeavyFileSystem"] >= 0
+    assert report.not_imported == ["heavy_fs:create_filesystem"]
+
+
+def test_invalid_reference() -> None:
+    kernel = Kernel()
+
+    with pytest.raises(ValueError):
+        kernel.bind(IFileSystem, to="heavy_fs.HeavyFileSystem")
+
+
+def test_missing_module_is_reported_by_validation() -> None:
+    kernel = Kernel()
+    kernel.bind(IFileSystem, to="not_existing_module:FileSystem")
+
+    assert not kernel.validate().ok
+    with pytest.raises(ImportError):
+        kernel.get(IFileSystem)  # type: ignore
@@ -58,3 +58,43 @@ def test_configure_fn() -> None:
 
     inst = kernel.get(IFileSystem)  # type: ignore
     assert isinstance(inst, InMemoryFileSystem)
+
+
+def test_factories_are_collected_once_per_class() -> None:
+    """
+    Installing a module doesn't touch other attributes (like properties).
+    """
+
+    class MyModule(Module):
+        @property
+        def expensive(self) -> None:
+            raise AssertionError("should not be called")
+
+        @factory()
+        def my_filesystem(self) -> IFileSystem:
+            return S3FileSystem()
+
+    assert [name for name, _ in MyModule._manifest] == ["my_filesystem"]
+
+    for _ in range(2):
+        kernel = Kernel()
+        kernel.install(MyModule())
+        assert isinstance(kernel.get(IFileSystem), S3FileSystem)  # type: ignore
+
+
+def test_factories_can_be_overridden_in_subclass() -> None:
+    class BaseModule(Module):
+        @factory()
+        def my_filesystem(self) -> IFileSystem:
+            return S3FileSystem()
+
+    class TestModule(BaseModule):
+        @factory()
+        def my_filesystem(self) -> IFileSystem:
+            return InMemoryFileSystem()
+
+    kernel = Kernel()
+    kernel.install(TestModule())
+
+    assert isinstance(kernel.get(IFileSystem), InMemoryFileSystem)  # type: ignore
+    assert len(kernel._bindings[IFileSystem]) == 1
@@ -0,0 +1,176 @@
+"""
+Resolving every binding of a service (e.g. plugins).
+"""
+import abc
+import asyncio
+from typing import List, Sequence, Tuple
+
+from injectpy import Kernel, Lifetime
+
+
+class Plugin(abc.ABC):
+    @abc.abstractmethod
+    def name(self) -> str:
+        raise NotImplementedError
+
+
+class Logger:
+    pass
+
+
+class LoggingPlugin(Plugin):
+    def __init__(self, logger: Logger) -> None:
+        self.logger = logger
+
+    def name(self) -> str:
+        return "logging"
+
+
+class CachePlugin(Plugin):
+    def name(self) -> str:
+        return "cache"
+
+
+class App:
+    def __init__(self, plugins: List[Plugin]) -> None:
+        self.plugins = plugins
+
+
+def make_kernel() -> Kernel:
+    kernel = Kernel()
+    kernel.bind(Plugin, to=LoggingPlugin)
+    kernel.bind(Plugin, to=CachePlugin, lifetime=Lifetime.singleton)
+    return kernel
+
+
+def test_get_all_returns_instances_in_registration_order() -> None:
+    kernel = make_kernel()
+
+    plugins = kernel.get_all(Plugin)  # type: ignore
+
+    assert [plugin.name() for plugin in plugins] == ["logging", "cache"]
+    # the last binding is still used for a single instance
+    assert isinstance(kernel.get(Plugin), CachePlugin)  # type: ignore
+
+
+def test_get_all_without_bindings() -> None:
+    kernel = Kernel()
+
+    assert kernel.get_all(Plugin) == []  # type: ignore
+    # nothing is cached, so services which aren't bound can be collected
+    assert not kernel._multi_plans
+
+    kernel.bind(Plugin, to=CachePlugin)
+
+    plugins = kernel.get_all(Plugin)  # type: ignore
+
+    assert [plugin.name() for plugin in plugins] == ["cache"]
+
+
+def test_lifetime_of_each_binding_is_respected() -> None:
+    kernel = Kernel()
+    kernel.bind(Plugin, to=LoggingPlugin, lifetime=Lifetime.singleton)
+    kernel.bind(Plugin, to=CachePlugin)
+
+    first = kernel.get_all(Plugin)  # type: ignore
+    second = kernel.get_all(Plugin)  # type: ignore
+
+    assert first[0] is second[0]
+    assert first[1] is not second[1]
+
+
+def test_singletons_of_different_bindings_are_not_shared() -> None:
+    kernel = Kernel()
+    kernel.bind(Plugin, factory=CachePlugin, lifetime=Lifetime.singleton)
+    kernel.bind(Plugin, factory=CachePlugin, lifetime=Lifetime.singleton)
+
+    first, second = kernel.get_all(Plugin)  # type: ignore
+
+    assert first is not second
+    assert kernel.get(Plugin) is second  # type: ignore
+
+
+def test_collections_are_injected() -> None:
+    class Handlers:
+        def __init__(
+            self,
+            as_list: List[Plugin],
+            as_sequence: Sequence[Plugin],
+            as_tuple: Tuple[Plugin, ...],
+        ) -> None:
+            self.as_list = as_list
+            self.as_sequence = as_sequence
+            self.as_tuple = as_tuple
+
+    kernel = make_kernel()
+
+    handlers = kernel.get(Handlers)
+
+    assert isinstance(handlers.as_list, list)
+    assert [p.name() for p in handlers.as_list] == ["logging", "cache"]
+    assert isinstance(handlers.as_sequence, tuple)
+    assert isinstance(handlers.as_tuple, tuple)
+    assert handlers.as_tuple[1] is handlers.as_list[1]
+
+
+def test_empty_collection_is_injected() -> None:
+    kernel = Kernel()
+
+    assert kernel.get(App).plugins == []
+    assert kernel.validate().ok
+
+
+def test_explicit_binding_of_collection_takes_precedence() -> None:
+    kernel = make_kernel()
+    kernel.bind(List[Plugin], instance=[CachePlugin()])
+
+    assert [p.name() for p in kernel.get(App).plugins] == ["cache"]
+
+
+def test_new_bindings_are_picked_up() -> None:
+    kernel = make_kernel()
+    assert len(kernel.get(App).plugins) == 2
+
+    kernel.bind(Plugin, to=CachePlugin)
+
+    assert len(kernel.get(App).plugins) == 3
+
+
+def test_scoped_plugins() -> None:
+    kernel = Kernel()
+    kernel.bind(Plugin, to=CachePlugin, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        assert scope.get_all(Plugin) == scope.get_all(Plugin)  # type: ignore
+        assert scope.get(App).plugins == scope.get_all(Plugin)  # type: ignore
+
+
+def test_compiled_collections() -> None:
+    kernel = make_kernel()
+    resolve = kernel.compile(App)
+
+    first = resolve()
+    second = resolve()
+
+    assert [p.name() for p in first.plugins] == ["logging", "cache"]
+    assert first.plugins[0] is not second.plugins[0]
+    assert first.plugins[1] is second.plugins[1]
+
+
+def test_async_collections() -> None:
+    class AsyncPlugin(Plugin):
+        def name(self) -> str:
+            return "async"
+
+    async def create_plugin() -> Plugin:
+        await asyncio.sleep(0)
+        return AsyncPlugin()
+
+    kernel = make_kernel()
+    kernel.bind(Plugin, factory=create_plugin)
+
+    app = asyncio.run(kernel.aget(App))
+    plugins = asyncio.run(kernel.aget_all(Plugin))  # type: ignore
+
+    assert [p.name() for p in app.plugins] == ["logging", "cache", "async"]
+    assert [p.name() for p in plugins] == ["logging", "cache", "async"]
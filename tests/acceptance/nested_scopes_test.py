@@ -0,0 +1,146 @@
+"""
+Nesting scopes, e.g. per-connection and per-message scopes of a websocket
+server.
+"""
+import asyncio
+from typing import List
+
+import pytest
+
+from injectpy import BindingIsScoped, Kernel, Lifetime, Module, factory
+
+
+class Connection:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Message:
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_kernel() -> Kernel:
+    kernel = Kernel()
+    kernel.bind(Connection, lifetime=Lifetime.scoped, scope_level="connection")
+    kernel.bind(Message, lifetime=Lifetime.scoped, scope_level="message")
+    return kernel
+
+
+def test_instances_are_kept_in_scope_of_their_level() -> None:
+    kernel = make_kernel()
+
+    with kernel.nested_scope("connection") as connection_scope:
+        with connection_scope.nested_scope("message") as first:
+            message1 = first.get(Message)
+            assert first.get(Message) is message1
+
+        with connection_scope.nested_scope("message") as second:
+            message2 = second.get(Message)
+
+        assert message1 is not message2
+        assert message1.connection is message2.connection
+        assert message1.connection is connection_scope.get(Connection)
+        # only instances of the inner scope are disposed
+        assert message1.closed
+        assert not message1.connection.closed
+
+    assert message1.connection.closed
+
+
+def test_bindings_without_level_use_innermost_scope() -> None:
+    kernel = Kernel()
+    kernel.bind(Connection, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as outer:
+        with outer.nested_scope() as inner:
+            assert inner.get(Connection) is not outer.get(Connection)
+            assert inner.parent is outer
+
+
+def test_missing_level_raises() -> None:
+    kernel = make_kernel()
+
+    with kernel.nested_scope("message") as scope:
+        with pytest.raises(BindingIsScoped):
+            scope.get(Message)
+
+
+def test_lookup_doesnt_depend_on_depth() -> None:
+    kernel = make_kernel()
+
+    with kernel.nested_scope("connection") as scope:
+        connection = scope.get(Connection)
+        for _ in range(100):
+            scope = scope.nested_scope()
+
+        assert scope._levels["connection"].get(Connection) is connection
+        assert scope.get(Connection) is connection
+
+
+def test_ambient_nested_scope() -> None:
+    kernel = make_kernel()
+
+    with kernel.nested_scope("connection") as connection_scope:
+        with connection_scope.nested_scope("message"):
+            message = kernel.get(Message)
+
+        assert kernel.get(Connection) is message.connection
+
+
+def test_compiled_nested_scopes() -> None:
+    kernel = make_kernel()
+    resolve = kernel.compile(Message)
+
+    with kernel.nested_scope("connection") as connection_scope:
+        with connection_scope.nested_scope("message") as scope:
+            message = resolve(scope)
+            assert resolve(scope) is message
+
+        with connection_scope.nested_scope("message") as scope:
+            assert resolve(scope).connection is message.connection
+
+
+def test_async_nested_scopes() -> None:
+    kernel = make_kernel()
+
+    async def main() -> List[Message]:
+        async with kernel.nested_scope("connection") as connection_scope:
+            messages = []
+            for _ in range(2):
+                async with connection_scope.nested_scope("message") as scope:
+                    messages.append(await scope.aget(Message))
+
+            return messages
+
+    first, second = asyncio.run(main())
+    assert first is not second
+    assert first.connection is second.connection
+
+
+def test_module_factory_with_scope_level() -> None:
+    class ConnectionModule(Module):
+        @factory(lifetime=Lifetime.scoped, scope_level="connection")
+        def create_connection(self) -> Connection:
+            return Connection()
+
+    kernel = Kernel()
+    kernel.install(ConnectionModule())
+
+    with kernel.nested_scope("connection") as scope:
+        with scope.nested_scope() as inner:
+            assert inner.get(Connection) is scope.get(Connection)
+
+
+def test_scope_level_requires_scoped_lifetime() -> None:
+    kernel = Kernel()
+
+    with pytest.raises(ValueError):
+        kernel.bind(Connection, scope_level="connection")
@@ -0,0 +1,144 @@
+"""
+Pooled lifetime: expensive instances are reused between scopes.
+"""
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from injectpy import (
+    BindingIsScoped,
+    Kernel,
+    Lifetime,
+    Module,
+    PoolExhausted,
+    factory,
+)
+from injectpy.pool import PoolStats
+
+
+class Parser:
+    def close(self) -> None:
+        raise AssertionError("pooled instances must not be disposed")
+
+
+def test_pooled_instance_is_shared_inside_scope() -> None:
+    kernel = Kernel()
+    kernel.bind(Parser, lifetime=Lifetime.pooled, pool_size=2)
+
+    with kernel.nested_scope() as scope:
+        assert scope.get(Parser) is scope.get(Parser)
+
+
+def test_pooled_instances_are_reused_between_scopes() -> None:
+    kernel = Kernel()
+    kernel.bind(Parser, lifetime=Lifetime.pooled, pool_size=2)
+
+    with kernel.nested_scope() as scope:
+        inst1 = scope.get(Parser)
+
+    with kernel.nested_scope() as scope:
+        inst2 = scope.get(Parser)
+
+    assert inst1 is inst2
+    assert kernel.pool_stats(Parser) == PoolStats(hits=1, misses=1, size=1, idle=1)
+
+
+def test_pool_creates_instances_up_to_max_size() -> None:
+    kernel = Kernel()
+    kernel.bind(Parser, lifetime=Lifetime.pooled, pool_size=2, pool_timeout=0)
+
+    with kernel.nested_scope() as scope1, kernel.nested_scope() as scope2:
+        assert scope1.get(Parser) is not scope2.get(Parser)
+
+        with pytest.raises(PoolExhausted):
+            with kernel.nested_scope() as scope3:
+                scope3.get(Parser)
+
+    assert kernel.pool_stats(Parser) == PoolStats(misses=2, waits=1, size=2, idle=2)
+
+
+def test_exhausted_pool_blocks_until_instance_is_returned() -> None:
+    kernel = Kernel()
+    kernel.bind(Parser, lifetime=Lifetime.pooled, pool_size=1)
+    acquired = threading.Event()
+    instances: List[Parser] = []
+
+    def worker() -> None:
+        acquired.wait(timeout=5)
+        with kernel.nested_scope() as scope:
+            instances.append(scope.get(Parser))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+
+    with kernel.nested_scope() as scope:
+        instances.append(scope.get(Parser))
+        acquired.set()
+        while kernel.pool_stats(Parser).waits == 0:
+            time.sleep(0.001)
+
+    thread.join()
+    assert instances[0] is instances[1]
+
+
+def test_pooled_binding_requires_scope() -> None:
+    kernel = Kernel()
+    kernel.bind(Parser, lifetime=Lifetime.pooled, pool_size=1)
+
+    with pytest.raises(BindingIsScoped):
+        kernel.get(Parser)
+
+
+def test_pool_size_is_required() -> None:
+    kernel = Kernel()
+
+    with pytest.raises(ValueError):
+        kernel.bind(Parser, lifetime=Lifetime.pooled)
+
+    with pytest.raises(ValueError):
+        kernel.bind(Parser, pool_size=1)
+
+
+def test_pooled_factory_in_module() -> None:
+    class MyModule(Module):
+        @factory(lifetime=Lifetime.pooled, pool_size=1, pool_timeout=0)
+        def parser(self) -> Parser:
+            return Parser()
+
+    kernel = Kernel()
+    kernel.install(MyModule())
+
+    with kernel.nested_scope() as scope:
+        scope.get(Parser)
+
+    assert kernel.pool_stats(Parser).size == 1
+
+
+def test_async_pool_waits_without_blocking_event_loop() -> None:
+    created: List[Parser] = []
+
+    async def create_parser() -> Parser:
+        await asyncio.sleep(0)
+        created.append(Parser())
+        return created[-1]
+
+    kernel = Kernel()
+    kernel.bind(Parser, factory=create_parser, lifetime=Lifetime.pooled, pool_size=1)
+
+    async def handle_message() -> Parser:
+        async with kernel.nested_scope() as scope:
+            parser = await scope.aget(Parser)
+            await asyncio.sleep(0.01)
+            return parser
+
+    async def main() -> List[Parser]:
+        return await asyncio.gather(*[handle_message() for _ in range(3)])
+
+    parsers = asyncio.run(main())
+
+    assert len(created) == 1
+    assert parsers == created * 3
+    assert kernel.pool_stats(Parser).waits == 2
@@ -0,0 +1,171 @@
+"""
+Resolving dependencies only when they are used.
+"""
+import asyncio
+from typing import List
+
+import pytest
+
+from injectpy import (
+    BindingIsScoped,
+    Kernel,
+    Lazy,
+    Lifetime,
+    MissingBinding,
+    Provider,
+)
+from tests.types import IFileSystem
+
+
+class Heavy:
+    created = 0
+
+    def __init__(self) -> None:
+        Heavy.created += 1
+
+
+class Handler:
+    def __init__(self, heavy: Provider[Heavy]) -> None:
+        self.heavy = heavy
+
+
+class LazyHandler:
+    def __init__(self, heavy: Lazy[Heavy]) -> None:
+        self.heavy = heavy
+
+
+@pytest.fixture(autouse=True)
+def reset_counter() -> None:
+    Heavy.created = 0
+
+
+def test_provider_resolves_on_every_call() -> None:
+    kernel = Kernel()
+
+    handler = kernel.get(Handler)
+    assert Heavy.created == 0
+
+    first, second = handler.heavy(), handler.heavy()
+
+    assert isinstance(first, Heavy)
+    assert first is not second
+    assert Heavy.created == 2
+
+
+def test_provider_respects_lifetime() -> None:
+    kernel = Kernel()
+    kernel.bind(Heavy, lifetime=Lifetime.singleton)
+
+    handler = kernel.get(Handler)
+
+    assert handler.heavy() is handler.heavy() is kernel.get(Heavy)
+
+
+def test_lazy_resolves_once() -> None:
+    kernel = Kernel()
+
+    handler = kernel.get(LazyHandler)
+    assert not handler.heavy.resolved
+
+    assert handler.heavy.value is handler.heavy.value
+    assert handler.heavy.resolved
+    assert Heavy.created == 1
+
+
+def test_scope_is_captured() -> None:
+    kernel = Kernel()
+    kernel.bind(Heavy, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        handler = scope.get(Handler)
+        lazy_handler = scope.get(LazyHandler)
+
+        assert handler.heavy() is scope.get(Heavy)
+        assert lazy_handler.heavy.value is scope.get(Heavy)
+
+
+def test_singletons_dont_capture_scope() -> None:
+    kernel = Kernel()
+    kernel.bind(Heavy, lifetime=Lifetime.scoped)
+    kernel.bind(Handler, lifetime=Lifetime.singleton)
+
+    with kernel.nested_scope() as scope:
+        handler = scope.get(Handler)
+        assert handler.heavy() is scope.get(Heavy)
+
+    with pytest.raises(BindingIsScoped):
+        handler.heavy()
+
+    # scope active when the provider is called is used
+    with kernel.nested_scope() as other:
+        assert handler.heavy() is other.get(Heavy)
+
+
+class Parent:
+    def __init__(self, children: Provider["Child"]) -> None:
+        self.children = children
+
+
+class Child:
+    def __init__(self, parent: Parent) -> None:
+        self.parent = parent
+
+
+def test_provider_breaks_cycles() -> None:
+    kernel = Kernel()
+    kernel.bind(Parent, lifetime=Lifetime.singleton)
+    kernel.bind(Child)
+
+    parent = kernel.get(Parent)
+
+    assert parent.children().parent is parent
+    assert kernel.validate().ok
+
+
+def test_missing_deferred_binding_is_reported() -> None:
+    class Service:
+        def __init__(self, fs: Lazy[IFileSystem]) -> None:
+            self.fs = fs
+
+    kernel = Kernel()
+    kernel.bind(Service)
+
+    with pytest.raises(MissingBinding):
+        kernel.validate().raise_for_problems()
+
+
+def test_compiled_provider() -> None:
+    kernel = Kernel()
+    kernel.bind(Heavy, lifetime=Lifetime.scoped)
+    resolve = kernel.compile(Handler)
+
+    with kernel.nested_scope() as scope:
+        handler = resolve(scope)
+
+        assert handler.heavy() is scope.get(Heavy)
+
+
+def test_async_providers() -> None:
+    async def create_heavy() -> Heavy:
+        await asyncio.sleep(0)
+        return Heavy()
+
+    class AsyncHandler:
+        def __init__(self, heavy: Provider[Heavy], lazy: Lazy[Heavy]) -> None:
+            self.heavy = heavy
+            self.lazy = lazy
+
+    kernel = Kernel()
+    kernel.bind(Heavy, factory=create_heavy)
+
+    async def run() -> List[Heavy]:
+        handler = await kernel.aget(AsyncHandler)
+        assert Heavy.created == 0
+        lazy = await handler.lazy.aget()
+        return [await handler.heavy.aget(), lazy, await handler.lazy.aget()]
+
+    first, second, third = asyncio.run(run())
+
+    assert first is not second
+    assert second is third
+    assert Heavy.created == 2
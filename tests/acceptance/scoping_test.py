@@ -1,11 +1,19 @@
+import asyncio
 import itertools
 import sys
 import threading
+import tracemalloc
 from typing import Any, List
 
 import pytest
 
-from injectpy import BindingIsScoped, Kernel, Lifetime
+from injectpy import (
+    BindingIsScoped,
+    CircularDependency,
+    DisposalError,
+    Kernel,
+    Lifetime,
+)
 from tests.types import IFileSystem, InMemoryFileSystem
 
 
@@ -210,3 +218,419 @@ def test_singleton_scope_is_thread_safe(request: Any) -> None:
     print(instances)
     for inst in instances[1:]:
         assert instances[0] is inst
+
+
+def test_unrelated_singletons_are_created_concurrently() -> None:
+    """
+    Creating one singleton must not block creation of unrelated
+    singletons in other threads.
+    """
+    first_started = threading.Event()
+    second_created = threading.Event()
+
+    class SlowClient:
+        def __init__(self) -> None:
+            first_started.set()
+            # would time out if the other singleton had to wait for us
+            assert second_created.wait(timeout=5)
+
+    class FastClient:
+        def __init__(self) -> None:
+            second_created.set()
+
+    kernel = Kernel()
+    kernel.bind(SlowClient, lifetime=Lifetime.singleton)
+    kernel.bind(FastClient, lifetime=Lifetime.singleton)
+    errors: List[BaseException] = []
+
+    def worker() -> None:
+        try:
+            kernel.get(SlowClient)
+        except BaseException as exc:  # pragma: no cover
+            errors.append(exc)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert first_started.wait(timeout=5)
+    fast = kernel.get(FastClient)
+    thread.join()
+
+    assert not errors
+    assert kernel.get(FastClient) is fast
+    assert isinstance(kernel.get(SlowClient), SlowClient)
+
+
+def test_singleton_depending_on_singleton() -> None:
+    """
+    Creating singleton with singleton dependencies must not deadlock.
+    """
+
+    class Client:
+        pass
+
+    class Service:
+        def __init__(self, client: Client) -> None:
+            self.client = client
+
+    kernel = Kernel()
+    kernel.bind(Client, lifetime=Lifetime.singleton)
+    kernel.bind(Service, lifetime=Lifetime.singleton)
+
+    assert kernel.get(Service).client is kernel.get(Client)
+
+
+class Meeting:
+    pass
+
+
+class Chicken:
+    def __init__(self, meeting: Meeting, egg: "Egg") -> None:
+        self.egg = egg
+
+
+class Egg:
+    def __init__(self, meeting: Meeting, chicken: Chicken) -> None:
+        self.chicken = chicken
+
+
+def test_singleton_cycle_created_by_two_threads() -> None:
+    """
+    Each thread creates one half of the cycle, waiting for the other one
+    would never end.
+    """
+    barrier = threading.Barrier(2, timeout=5)
+    meetings = itertools.count()
+
+    def meet() -> Meeting:
+        # both singletons are being created before either is requested
+        if next(meetings) < 2:
+            barrier.wait()
+        return Meeting()
+
+    kernel = Kernel()
+    kernel.bind(Meeting, factory=meet)
+    kernel.bind(Chicken, lifetime=Lifetime.singleton)
+    kernel.bind(Egg, lifetime=Lifetime.singleton)
+    errors: List[BaseException] = []
+
+    def worker(service: type) -> None:
+        try:
+            kernel.get(service)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(cls,)) for cls in (Chicken, Egg)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert [type(exc) for exc in errors] == [CircularDependency] * 2
+
+
+class Resource:
+    def __init__(self, log: List[str], name: str) -> None:
+        self.log = log
+        self.name = name
+
+    def close(self) -> None:
+        self.log.append(self.name)
+
+
+def test_scoped_instances_are_disposed_in_reverse_order() -> None:
+    """
+    When scope ends its instances are closed - dependents first.
+    """
+    log: List[str] = []
+
+    class Connection(Resource):
+        pass
+
+    class Session(Resource):
+        def __init__(self, conn: Connection) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(
+        Connection,
+        factory=lambda: Connection(log, "connection"),
+        lifetime=Lifetime.scoped,
+    )
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        scope.get(Session)
+        assert log == []
+
+    assert log == ["session", "connection"]
+
+
+def test_disposal_errors_do_not_stop_other_disposals() -> None:
+    log: List[str] = []
+
+    class Broken:
+        def close(self) -> None:
+            raise ValueError("can't close")
+
+    class Session(Resource):
+        def __init__(self, broken: Broken) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(Broken, lifetime=Lifetime.scoped)
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+
+    with pytest.raises(DisposalError) as info:
+        with kernel.nested_scope() as scope:
+            scope.get(Session)
+            scope.get(Broken)
+
+    assert log == ["session"]
+    assert [str(exc) for exc in info.value.errors] == ["can't close"]
+
+
+def test_instance_bound_to_multiple_services_is_disposed_once() -> None:
+    log: List[str] = []
+
+    class Session(Resource):
+        def __init__(self) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+    kernel.bind(Resource, to=Session, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        assert scope.get(Resource) is scope.get(Session)  # type: ignore
+
+    assert log == ["session"]
+
+
+def test_scope_does_not_dispose_instances_it_does_not_own() -> None:
+    """
+    Scoped ``to=`` binding can point at a singleton or an instance,
+    those must outlive the scope.
+    """
+    log: List[str] = []
+
+    class Connection(Resource):
+        def __init__(self) -> None:
+            super().__init__(log, "connection")
+
+    class IConnection:
+        pass
+
+    class IConfig:
+        pass
+
+    config = Resource(log, "config")
+
+    kernel = Kernel()
+    kernel.bind(Connection, lifetime=Lifetime.singleton)
+    kernel.bind(IConnection, to=Connection, lifetime=Lifetime.scoped)
+    kernel.bind(Resource, instance=config)
+    kernel.bind(IConfig, to=Resource, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        assert scope.get(IConnection) is kernel.get(Connection)  # type: ignore
+        assert scope.get(IConfig) is config  # type: ignore
+
+    async def main() -> None:
+        async with kernel.nested_scope() as scope:
+            assert await scope.aget(IConnection) is kernel.get(Connection)
+            assert await scope.aget(IConfig) is config
+
+    asyncio.run(main())
+    assert log == []
+
+
+def test_scoped_binding_to_transient_service_is_disposed() -> None:
+    log: List[str] = []
+
+    class Session(Resource):
+        def __init__(self) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(Resource, to=Session, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        scope.get(Resource)
+
+    assert log == ["session"]
+
+
+def test_scoped_instances_are_disposed_asynchronously() -> None:
+    log: List[str] = []
+
+    class AsyncSession:
+        async def aclose(self) -> None:
+            await asyncio.sleep(0)
+            log.append("async session")
+
+    class Session(Resource):
+        def __init__(self, async_session: AsyncSession) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(AsyncSession, lifetime=Lifetime.scoped)
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+
+    async def main() -> None:
+        async with kernel.nested_scope() as scope:
+            await scope.aget(Session)
+
+    asyncio.run(main())
+    assert log == ["session", "async session"]
+
+
+def test_kernel_uses_scope_entered_with_statement() -> None:
+    kernel = Kernel()
+    kernel.bind(InMemoryFileSystem, lifetime=Lifetime.scoped)
+
+    with kernel.nested_scope() as scope:
+        assert kernel.current_scope() is scope
+        assert kernel.get(InMemoryFileSystem) is scope.get(InMemoryFileSystem)
+
+        with kernel.nested_scope() as inner:
+            assert kernel.get(InMemoryFileSystem) is inner.get(InMemoryFileSystem)
+
+        assert kernel.get(InMemoryFileSystem) is scope.get(InMemoryFileSystem)
+
+    assert kernel.current_scope() is None
+    with pytest.raises(BindingIsScoped):
+        kernel.get(InMemoryFileSystem)
+
+
+def test_scope_of_other_kernel_is_ignored() -> None:
+    kernel = Kernel()
+    kernel.bind(InMemoryFileSystem, lifetime=Lifetime.scoped)
+
+    with Kernel().nested_scope():
+        assert kernel.current_scope() is None
+        with pytest.raises(BindingIsScoped):
+            kernel.get(InMemoryFileSystem)
+
+
+def test_ambient_scope_is_not_shared_between_tasks() -> None:
+    kernel = Kernel()
+    kernel.bind(InMemoryFileSystem, lifetime=Lifetime.scoped)
+
+    async def handle_request() -> Any:
+        async with kernel.nested_scope() as scope:
+            await asyncio.sleep(0)
+            instance = await kernel.aget(InMemoryFileSystem)
+            assert instance is scope.get(InMemoryFileSystem)
+            return instance
+
+    async def main() -> List[Any]:
+        return await asyncio.gather(*[handle_request() for _ in range(10)])
+
+    instances = asyncio.run(main())
+    assert len({id(instance) for instance in instances}) == 10
+
+
+def test_ambient_scope_is_not_shared_between_threads() -> None:
+    kernel = Kernel()
+    kernel.bind(InMemoryFileSystem, lifetime=Lifetime.scoped)
+    errors: List[BaseException] = []
+
+    def worker() -> None:
+        try:
+            kernel.get(InMemoryFileSystem)
+        except BaseException as exc:
+            errors.append(exc)
+
+    with kernel.nested_scope():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], BindingIsScoped)
+
+
+def test_scope_can_be_reused() -> None:
+    log: List[str] = []
+
+    class Session(Resource):
+        def __init__(self) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+    scope = kernel.nested_scope()
+    instances = scope._instances
+
+    with scope:
+        first = scope.get(Session)
+
+    with scope:
+        second = scope.get(Session)
+        assert kernel.get(Session) is second
+
+    assert first is not second
+    assert log == ["session", "session"]
+    # containers are cleared, not replaced
+    assert scope._instances is instances
+
+
+def test_scope_reset() -> None:
+    log: List[str] = []
+
+    class Session(Resource):
+        def __init__(self) -> None:
+            super().__init__(log, "session")
+
+    kernel = Kernel()
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+    scope = kernel.nested_scope()
+
+    first = scope.get(Session)
+    scope.reset()
+
+    assert log == ["session"]
+    assert scope.get(Session) is not first
+
+
+def test_scope_reset_does_not_allocate_containers() -> None:
+    """
+    Memory needed to reset a reused scope doesn't depend on the number of
+    its instances, as no containers are built for them.
+    """
+
+    class Session:
+        def close(self) -> None:
+            pass
+
+    def reset_peak(count: int) -> int:
+        kernel = Kernel()
+        services = [type(f"Session{i}", (Session,), {}) for i in range(count)]
+        for service in services:
+            kernel.bind(service, lifetime=Lifetime.scoped)
+
+        scope = kernel.nested_scope()
+        for _ in range(2):
+            for service in services:
+                scope.get(service)
+
+            tracemalloc.start()
+            try:
+                current, _ = tracemalloc.get_traced_memory()
+                scope.reset()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return peak - current
+
+    assert reset_peak(100) == reset_peak(1)
+
+
+def test_scope_has_no_instance_dict() -> None:
+    scope = Kernel().nested_scope()
+
+    with pytest.raises(AttributeError):
+        scope.foo = 1  # type: ignore
@@ -0,0 +1,156 @@
+"""
+Storing reflection results on disk for faster startup.
+"""
+import sys
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from injectpy import Kernel, Lifetime
+from injectpy.reflection import Inspection
+
+MODULE = '''
+from typing import List, Optional
+
+
+class Config:
+    pass
+
+
+class Database:
+    def __init__(self, config: Config, name: Optional[str] = None) -> None:
+        self.config = config
+
+
+class Plugin:
+    pass
+
+
+class Service:
+    def __init__(self, db: Database, plugins: List[Plugin]) -> None:
+        self.db = db
+'''
+
+
+@pytest.fixture
+def app(tmp_path: Path, monkeypatch: Any) -> Iterator[Any]:
+    path = tmp_path / "snapshot_app.py"
+    path.write_text(MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    __import__("snapshot_app")
+    yield sys.modules["snapshot_app"]
+    sys.modules.pop("snapshot_app", None)
+
+
+@pytest.fixture
+def inspected(monkeypatch: Any) -> List[Any]:
+    calls: List[Any] = []
+    original = Inspection.inspect
+
+    def counting_inspect(obj: Any) -> Inspection:
+        calls.append(obj)
+        return original(obj)
+
+    monkeypatch.setattr(Inspection, "inspect", counting_inspect)
+    return calls
+
+
+def make_kernel(app: Any) -> Kernel:
+    kernel = Kernel()
+    kernel.bind(app.Config, lifetime=Lifetime.singleton)
+    kernel.bind(app.Database)
+    return kernel
+
+
+def test_snapshot_replaces_reflection(
+    app: Any, tmp_path: Path, inspected: List[Any]
+) -> None:
+    path = str(tmp_path / "snapshot.json")
+    assert make_kernel(app).save_snapshot(path) == 2
+    inspected.clear()
+
+    kernel = make_kernel(app)
+    assert kernel.load_snapshot(path)
+    db = kernel.get(app.Database)
+
+    assert inspected == []
+    assert db.config is kernel.get(app.Config)
+
+
+def test_not_supported_hints_use_reflection(
+    app: Any, tmp_path: Path, inspected: List[Any]
+) -> None:
+    path = str(tmp_path / "snapshot.json")
+    kernel = make_kernel(app)
+    kernel.bind(app.Service)
+    kernel.save_snapshot(path)
+    inspected.clear()
+
+    kernel = make_kernel(app)
+    kernel.bind(app.Service)
+    kernel.load_snapshot(path)
+    service = kernel.get(app.Service)
+
+    assert inspected == [app.Service]
+    assert isinstance(service.db, app.Database)
+
+
+def test_stale_entries_are_ignored(
+    app: Any, tmp_path: Path, inspected: List[Any]
+) -> None:
+    path = str(tmp_path / "snapshot.json")
+    make_kernel(app).save_snapshot(path)
+    with open(app.__file__, "a") as fp:
+        fp.write("\n# modified\n")
+
+    inspected.clear()
+    kernel = make_kernel(app)
+    kernel.load_snapshot(path)
+    kernel.get(app.Database)
+
+    assert inspected == [app.Database, app.Config]
+
+
+def test_entries_depend_on_modules_of_base_classes(
+    app: Any, tmp_path: Path, inspected: List[Any]
+) -> None:
+    """
+    ``__init__`` can be added to any base class, not only to the one which
+    currently defines it.
+    """
+    (tmp_path / "snapshot_middle.py").write_text(
+        "from snapshot_app import Database\n\n\nclass Middle(Database):\n    pass\n"
+    )
+    (tmp_path / "snapshot_leaf.py").write_text(
+        "from snapshot_middle import Middle\n\n\nclass Leaf(Middle):\n    pass\n"
+    )
+    path = str(tmp_path / "snapshot.json")
+    try:
+        leaf = __import__("snapshot_leaf").Leaf
+        kernel = make_kernel(app)
+        kernel.bind(leaf)
+        assert kernel.save_snapshot(path) == 3
+        with open(tmp_path / "snapshot_middle.py", "a") as fp:
+            fp.write("\n# modified\n")
+
+        inspected.clear()
+        kernel = make_kernel(app)
+        kernel.bind(leaf)
+        kernel.load_snapshot(path)
+        kernel.get(leaf)
+
+        assert inspected == [leaf]
+    finally:
+        sys.modules.pop("snapshot_middle", None)
+        sys.modules.pop("snapshot_leaf", None)
+
+
+def test_invalid_snapshot_is_ignored(app: Any, tmp_path: Path) -> None:
+    kernel = make_kernel(app)
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("{not json")
+
+    assert not kernel.load_snapshot(str(tmp_path / "missing.json"))
+    assert not kernel.load_snapshot(str(invalid))
+    assert isinstance(kernel.get(app.Database), app.Database)
@@ -0,0 +1,178 @@
+"""
+Validating configuration without creating instances.
+"""
+from typing import List
+
+import pytest
+
+from injectpy import (
+    CaptiveDependency,
+    CircularDependency,
+    Kernel,
+    Lifetime,
+    MissingBinding,
+)
+from injectpy.validation import ProblemKind
+from tests.types import IFileSystem, InMemoryFileSystem
+
+
+class Session:
+    pass
+
+
+class Repository:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+
+class Service:
+    def __init__(self, repo: Repository, fs: IFileSystem) -> None:
+        self.repo = repo
+        self.fs = fs
+
+
+def test_valid_configuration() -> None:
+    created = []
+
+    class Tracked:
+        def __init__(self) -> None:
+            created.append(self)
+
+    kernel = Kernel()
+    kernel.bind(Service)
+    kernel.bind(IFileSystem, to=InMemoryFileSystem, lifetime=Lifetime.singleton)
+    kernel.bind(Tracked, lifetime=Lifetime.singleton)
+
+    report = kernel.validate()
+
+    assert report.ok
+    assert created == []
+    # dependencies always go first
+    assert report.order.index(Session) < report.order.index(Repository)
+    assert report.order.index(Repository) < report.order.index(Service)
+    assert report.order.index(InMemoryFileSystem) < report.order.index(IFileSystem)
+    assert report.order.index(IFileSystem) < report.order.index(Service)
+    assert Tracked in report.order
+
+
+def test_missing_binding() -> None:
+    kernel = Kernel()
+    kernel.bind(Service)
+
+    report = kernel.validate()
+
+    assert [(p.kind, str(p)) for p in report.problems] == [
+        (ProblemKind.missing, "Service -> IFileSystem")
+    ]
+    with pytest.raises(MissingBinding):
+        report.raise_for_problems()
+
+
+class First:
+    def __init__(self, second: "Second") -> None:
+        pass
+
+
+class Second:
+    def __init__(self, third: "Third") -> None:
+        pass
+
+
+class Third:
+    def __init__(self, first: First) -> None:
+        pass
+
+
+def test_circular_dependency() -> None:
+    kernel = Kernel()
+    kernel.bind(First)
+
+    report = kernel.validate()
+
+    assert [(p.kind, str(p)) for p in report.problems] == [
+        (ProblemKind.cycle, "First -> Second -> Third -> First")
+    ]
+    with pytest.raises(CircularDependency):
+        kernel.freeze()
+
+
+def test_singleton_capturing_scoped_service() -> None:
+    kernel = Kernel()
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Service, lifetime=Lifetime.singleton)
+
+    report = kernel.validate()
+
+    assert [(p.kind, str(p)) for p in report.problems] == [
+        (ProblemKind.captive, "Service -> Repository -> Session")
+    ]
+    with pytest.raises(CaptiveDependency):
+        kernel.freeze()
+
+
+def test_pooled_service_capturing_scoped_service() -> None:
+    """
+    Pooled instances are reused by other scopes, so they can't keep
+    instances of the scope they were created with.
+    """
+    kernel = Kernel()
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+    kernel.bind(Repository, lifetime=Lifetime.pooled, pool_size=1)
+
+    report = kernel.validate()
+
+    assert [(p.kind, str(p)) for p in report.problems] == [
+        (ProblemKind.captive, "Repository -> Session")
+    ]
+
+
+def test_singleton_depending_on_singleton_with_scoped_dependency() -> None:
+    """
+    Problem is reported only for the singleton which captures scoped service.
+    """
+    kernel = Kernel()
+    kernel.bind(Session, lifetime=Lifetime.scoped)
+    kernel.bind(Repository, lifetime=Lifetime.singleton)
+    kernel.bind(IFileSystem, to=InMemoryFileSystem)
+    kernel.bind(Service, lifetime=Lifetime.singleton)
+
+    report = kernel.validate()
+
+    assert [str(p) for p in report.problems] == ["Repository -> Session"]
+
+
+class Plugin:
+    pass
+
+
+class BrokenPlugin(Plugin):
+    def __init__(self, fs: IFileSystem) -> None:
+        self.fs = fs
+
+
+class WorkingPlugin(Plugin):
+    pass
+
+
+class Host:
+    def __init__(self, plugins: List[Plugin]) -> None:
+        self.plugins = plugins
+
+
+def test_every_binding_of_a_service_is_validated() -> None:
+    """
+    Earlier bindings are used by ``List[T]`` dependencies, so they are
+    checked too (not just the one returned by ``get()``).
+    """
+    kernel = Kernel()
+    kernel.bind(Plugin, to=BrokenPlugin)
+    kernel.bind(Plugin, to=WorkingPlugin)
+    kernel.bind(Host)
+
+    report = kernel.validate()
+
+    assert [problem.kind for problem in report.problems] == [ProblemKind.missing]
+    assert report.problems[0].path == (Plugin, BrokenPlugin, IFileSystem)
+    with pytest.raises(MissingBinding):
+        kernel.freeze()
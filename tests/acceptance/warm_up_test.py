@@ -0,0 +1,131 @@
+"""
+Creating singletons upfront.
+"""
+import threading
+from typing import List
+
+import pytest
+
+from injectpy import Kernel, Lifetime, MissingBinding
+from tests.types import IFileSystem
+
+
+def make_kernel(log: List[str]) -> Kernel:
+    class Config:
+        def __init__(self) -> None:
+            log.append("config")
+
+    class Database:
+        def __init__(self, config: Config) -> None:
+            log.append("database")
+
+    class Cache:
+        def __init__(self, config: Config) -> None:
+            log.append("cache")
+
+    class Handler:
+        def __init__(self, db: Database, cache: Cache) -> None:
+            log.append("handler")
+
+    kernel = Kernel()
+    kernel.bind(Handler)
+    kernel.bind(Database, lifetime=Lifetime.singleton)
+    kernel.bind(Cache, lifetime=Lifetime.singleton)
+    kernel.bind(Config, lifetime=Lifetime.singleton)
+    return kernel
+
+
+def test_warm_up_creates_singletons_in_dependency_order() -> None:
+    log: List[str] = []
+    kernel = make_kernel(log)
+
+    timings = kernel.warm_up()
+
+    assert log == ["config", "database", "cache"]
+    assert [cls.__name__ for cls in timings] == ["Config", "Database", "Cache"]
+    assert all(duration >= 0 for duration in timings.values())
+
+
+def test_warm_up_in_parallel() -> None:
+    log: List[str] = []
+    kernel = make_kernel(log)
+
+    timings = kernel.warm_up(workers=4)
+
+    assert sorted(log) == ["cache", "config", "database"]
+    assert log[0] == "config"
+    assert len(timings) == 3
+
+
+def test_warm_up_builds_independent_singletons_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    class First:
+        def __init__(self) -> None:
+            barrier.wait()
+
+    class Second:
+        def __init__(self) -> None:
+            barrier.wait()
+
+    kernel = Kernel()
+    kernel.bind(First, lifetime=Lifetime.singleton)
+    kernel.bind(Second, lifetime=Lifetime.singleton)
+
+    kernel.warm_up(workers=2)
+    assert isinstance(kernel.get(First), First)
+
+
+def test_warm_up_skips_async_singletons() -> None:
+    class Client:
+        pass
+
+    async def create_client() -> Client:
+        return Client()
+
+    class Service:
+        def __init__(self, client: Client) -> None:
+            pass
+
+    kernel = Kernel()
+    kernel.bind(Client, factory=create_client, lifetime=Lifetime.singleton)
+    kernel.bind(Service, lifetime=Lifetime.singleton)
+
+    assert kernel.warm_up() == {}
+
+
+def test_warm_up_validates_configuration() -> None:
+    class Service:
+        def __init__(self, fs: IFileSystem) -> None:
+            pass
+
+    kernel = Kernel()
+    kernel.bind(Service, lifetime=Lifetime.singleton)
+
+    with pytest.raises(MissingBinding):
+        kernel.warm_up()
+
+
+def test_warm_up_creates_singletons_of_every_binding() -> None:
+    log: List[str] = []
+
+    class Plugin:
+        def __init__(self) -> None:
+            log.append(type(self).__name__)
+
+    class First(Plugin):
+        pass
+
+    class Second(Plugin):
+        pass
+
+    kernel = Kernel()
+    kernel.bind(Plugin, to=First, lifetime=Lifetime.singleton)
+    kernel.bind(Plugin, to=Second, lifetime=Lifetime.singleton)
+
+    timings = kernel.warm_up()
+
+    assert list(timings) == [Plugin]
+    assert log == ["First", "Second"]
+    kernel.get_all(Plugin)
+    assert log == ["First", "Second"]
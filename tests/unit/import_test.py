@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import injectpy
+
+#: modules which are slow to import and not needed for synchronous resolution
+HEAVY_MODULES = ["asyncio", "attr", "concurrent.futures"]
+
+
+def test_import_doesnt_load_heavy_modules() -> None:
+    code = (
+        "import sys, injectpy\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    # make sure the same package is imported
+    path = os.path.dirname(os.path.dirname(injectpy.__file__))
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": path},
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_names_are_available() -> None:
+    from injectpy.instrumentation import StatsCollector
+
+    assert injectpy.StatsCollector is StatsCollector
+    assert "StatsCollector" in injectpy.__all__
@@ -1,6 +1,9 @@
-from typing import List, Optional, Union
+import asyncio
+import contextlib
+import io
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
-from injectpy.utils import strip_optional
+from injectpy.utils import adispose, dispose, strip_collection, strip_optional
 
 
 class TestStripOptional:
@@ -15,3 +18,56 @@ class TestStripOptional:
     def test_union_with_optional(self) -> None:
         assert strip_optional(Optional[Union[int, str]]) == (Union[int, str], True)
         assert strip_optional(Union[None, bool, str]) == (Union[bool, str], True)
+
+
+class TestStripCollection:
+    def test_not_collection(self) -> None:
+        assert strip_collection(int) == (int, None)
+        assert strip_collection(Optional[int]) == (Optional[int], None)
+        assert strip_collection(Tuple[int, str]) == (Tuple[int, str], None)
+
+    def test_collections(self) -> None:
+        assert strip_collection(List[int]) == (int, list)
+        assert strip_collection(Sequence[int]) == (int, tuple)
+        assert strip_collection(Tuple[int, ...]) == (int, tuple)
+
+
+class Closeable:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def close(self) -> None:
+        self.calls.append("close")
+
+    def __exit__(self, *args: Any) -> None:
+        self.calls.append("__exit__")
+
+
+class AsyncCloseable(Closeable):
+    async def aclose(self) -> None:
+        self.calls.append("aclose")
+
+
+class TestDispose:
+    def test_prefers_close(self) -> None:
+        inst = Closeable()
+        dispose(inst)
+        assert inst.calls == ["close"]
+
+    def test_uses_context_manager(self) -> None:
+        inst = io.StringIO()
+        dispose(contextlib.closing(inst))
+        assert inst.closed
+
+    def test_ignores_other_objects(self) -> None:
+        dispose(object())
+
+    def test_async_prefers_aclose(self) -> None:
+        inst = AsyncCloseable()
+        asyncio.run(adispose(inst))
+        assert inst.calls == ["aclose"]
+
+    def test_async_falls_back_to_close(self) -> None:
+        inst = Closeable()
+        asyncio.run(adispose(inst))
+        assert inst.calls == ["close"]